@@ -33,34 +33,50 @@ __version__ = "1.0.0"
 SMP_BUILD_TAG = "SMP_v200_unified"
 
 
-import sys, os
+import sys
+import bpy, functools, json, shutil, os, re, time, traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Dict, Tuple, List
 
-# === Safe PyFFI import (force bundled copy) ===
-from .safe_import import local_import
-import importlib.util
+try:
+    import numpy as np  # bundled with Blender
+except Exception:
+    np = None
 
-if "pyffi" in sys.modules:
-    del sys.modules["pyffi"]
+try:
+    import orjson  # optional C JSON codec; falls back to stdlib json
+except Exception:
+    orjson = None
 
-# Absolute path to your bundled PyFFI
-import os
 
-_pyffi_path = os.path.join(
-    os.path.dirname(__file__), "thirdparty", "pyffi", "__init__.py"
-)
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data.removeprefix(b"\xef\xbb\xbf"))
+    return json.loads(data)
 
-spec = importlib.util.spec_from_file_location("pyffi", _pyffi_path)
-pyffi = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(pyffi)
-print(f"[SMP init] Forced import of bundled PyFFI from {pyffi.__file__}")
 
+def _json_dumps_indent(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
 
-import bpy, json, shutil, os
-from pathlib import Path
-from typing import Optional, Dict, Tuple, List
 
-# --- NIF emissive parser (PyFFI-based) ---
-from . import nifparser  # skyrim_mat_patcher/nifparser.py
+# --- NIF emissive parser (PyNifly-based), imported on first use ---
+nifparser = None
+
+
+def _nif():
+    global nifparser
+    if nifparser is None:
+        from . import nifparser as _nifparser  # skyrim_mat_patcher/nifparser.py
+
+        nifparser = _nifparser
+    return nifparser
+
+
+# Cheap to import: its PyFFI load is deferred until slow mode actually runs
 from .pbrnifpatcher_ops import SKPBR_OT_RunPBRNifPatcher
 
 from bpy.props import (
@@ -73,6 +89,7 @@ from bpy.props import (
     CollectionProperty,
 )
 from bpy_extras.io_utils import ImportHelper
+from bpy.app.handlers import persistent
 
 # ----------------------------------------------------------------
 #  MO2 Virtual-Filesystem helpers  (used by emissive parser)
@@ -97,6 +114,78 @@ except Exception:
 _SMP_PROP_SYNC_GUARD = False
 
 
+class _prop_sync_guard:
+    """Hold _SMP_PROP_SYNC_GUARD for the duration of a block (restores prior state)."""
+
+    def __enter__(self):
+        global _SMP_PROP_SYNC_GUARD
+        self._prev = _SMP_PROP_SYNC_GUARD
+        _SMP_PROP_SYNC_GUARD = True
+
+    def __exit__(self, *exc):
+        global _SMP_PROP_SYNC_GUARD
+        _SMP_PROP_SYNC_GUARD = self._prev
+        return False
+
+
+# mat name -> emissive signature last pushed to its nodes; materials waiting for a push
+_EM_APPLIED: Dict[str, tuple] = {}
+_EM_DIRTY: set = set()
+
+
+def _emission_sig(mat) -> tuple:
+    s = mat.skpbr
+    count = len(mat.node_tree.nodes) if mat.node_tree else 0
+    if not s.emission_on:
+        # Off zeroes the strength; colour/strength edits while off change nothing
+        # visible and are pushed when emission is switched back on
+        return (False, None, None, count)
+    return (
+        True,
+        round(float(s.emission_strength), 5),
+        tuple(round(float(c), 5) for c in s.emission_color),
+        count,
+    )
+
+
+def _emission_apply(mat):
+    """Push emissive props to the nodes unless they already hold these values."""
+    try:
+        sig = _emission_sig(mat)
+        if _EM_APPLIED.get(mat.name) == sig:
+            return
+        with _prop_sync_guard():
+            _ensure_emissive_chain(mat)
+            _emissive_apply_to_nodes(mat)
+        _EM_APPLIED[mat.name] = sig
+    except Exception as e:
+        _log(f"[SMP] emissive refresh failed for {mat.name}: {e}")
+
+
+def _flush_emission():
+    names = tuple(_EM_DIRTY)
+    _EM_DIRTY.clear()
+    for name in names:
+        mat = bpy.data.materials.get(name)
+        if mat:
+            _emission_apply(mat)
+    return None
+
+
+def _emission_refresh(mat):
+    """Single, re-entrancy-safe entry point for emissive property updates."""
+    if _SMP_PROP_SYNC_GUARD or not mat:
+        return
+    if bpy.app.background:
+        # No event loop to run timers; apply straight away
+        _emission_apply(mat)
+        return
+    # Slider drags fire per step; apply once per timer tick with the latest values
+    _EM_DIRTY.add(mat.name)
+    if not bpy.app.timers.is_registered(_flush_emission):
+        bpy.app.timers.register(_flush_emission, first_interval=_FLUSH_INTERVAL)
+
+
 # ---------------------------------------------------------------------------
 # Logging helper
 # ---------------------------------------------------------------------------
@@ -104,6 +193,15 @@ def _log(msg: str):
     print(f"[Skyrim PBR] {msg}")
 
 
+# Per-material progress messages; off by default so builds skip the formatting
+_LOG_ENABLED = False
+
+
+def _logd(fmt: str, *args):
+    if _LOG_ENABLED:
+        _log(fmt % args if args else fmt)
+
+
 def _get_active_material(ctx):
     ob = getattr(ctx, "active_object", None)
     return getattr(ob, "active_material", None) if ob else None
@@ -119,23 +217,46 @@ KEY_LAST_SIBLING = "skpbr_last_sibling"
 
 
 def _store_anchor(mat, key: str, path: Path):
-    try:
-        mat[key] = str(path)
-    except Exception as e:
-        _log(f"Store anchor fail: {e}")
+    if mat is None or not path:
+        return
+    if not getattr(mat, "is_editable", True):
+        _log(f"Store anchor skipped: {mat.name} is linked/read-only")
+        return
+    mat[key] = str(path)
 
 
 def _load_anchor(mat, key: str):
     v = mat.get(key)
-    try:
-        return Path(v) if v else None
-    except Exception:
-        return None
+    return Path(v) if isinstance(v, str) and v else None
+
+
+# mat.name_full -> (tree version, first image path or None)
+_ANCHOR_CACHE: Dict[str, tuple] = {}
+KEY_TREE_VER = "_skpbr_ver"
+
+
+def _tree_version(nt):
+    return (len(nt.nodes), nt.get(KEY_TREE_VER, 0))
+
+
+def _bump_tree_version(nt):
+    nt[KEY_TREE_VER] = nt.get(KEY_TREE_VER, 0) + 1
 
 
 def _first_image_path_from_material(mat):
     if not mat or not mat.node_tree:
         return None
+    ver = _tree_version(mat.node_tree)
+    cached = _ANCHOR_CACHE.get(mat.name_full)
+    if cached is not None and cached[0] == ver:
+        return cached[1]
+    path = _first_image_path_scan(mat)
+    _ANCHOR_CACHE[mat.name_full] = (ver, path)
+    return path
+
+
+def _first_image_path_scan(mat):
+    # First image node in tree order, as the anchoring system has always chosen
     for n in mat.node_tree.nodes:
         if isinstance(n, bpy.types.ShaderNodeTexImage) and n.image:
             try:
@@ -165,40 +286,32 @@ class SKPBR_Prefs(bpy.types.AddonPreferences):
             col.prop(self, "manual_root")
 
 
+# mat.name -> (rgb, multiple) read from the material's NIF emissive props by
+# _init_emissive_from_nif; cleared per operator run and on file load
+_NIF_EMISSIVE: Dict[str, Tuple[tuple, float]] = {}
+
+
 def _apply_nif_emissive_to_bsdf_if_flag(mat):
     """Apply emissive color and multiple from NIF data to the BSDF node."""
     try:
+        hit = _NIF_EMISSIVE.get(mat.name)
+        if hit is None:
+            return
         nt = mat.node_tree
-        n_bsdf = next((n for n in nt.nodes if n.type == "BSDF_PRINCIPLED"), None)
+        n_bsdf = _label_node(mat, LBL_BSDF) or _smp_find_bsdf(nt)
         if not n_bsdf:
             return
 
-        # Find emissive color and strength from NIF data
-        emissive_color = getattr(mat, "emissive_color", None)
-        emissive_mult = getattr(mat, "emissive_multiple", None)
-
-        if (
-            emissive_color
-            and isinstance(emissive_color, (list, tuple))
-            and len(emissive_color) >= 3
-        ):
-            n_bsdf.inputs["Emission"].default_value = (
-                emissive_color[0],
-                emissive_color[1],
-                emissive_color[2],
-                1.0,
-            )
-
-        # If emissive multiple (strength) exists and > 0
-        if emissive_mult is not None:
-            try:
-                n_bsdf.inputs["Emission Strength"].default_value = emissive_mult
-            except Exception:
-                pass
+        c, mult = hit
+        # Blender 4.x renamed the Principled "Emission" input to "Emission Color"
+        sock = n_bsdf.inputs.get("Emission Color") or n_bsdf.inputs.get("Emission")
+        if sock is not None:
+            sock.default_value = (float(c[0]), float(c[1]), float(c[2]), 1.0)
+        sock = n_bsdf.inputs.get("Emission Strength")
+        if sock is not None:
+            sock.default_value = mult
 
-        _log(
-            f"[NIF] Applied emissive color {emissive_color} × {emissive_mult} to {mat.name}"
-        )
+        _logd("[NIF] Applied emissive color %s × %s to %s", tuple(c), mult, mat.name)
 
     except Exception as e:
         _log(f"[NIF] Failed to apply emissive to {mat.name}: {e}")
@@ -264,6 +377,24 @@ def _get_build_status(mat: bpy.types.Material) -> str:
     return ""
 
 
+def _reset_build_caches():
+    """Start an operator run from fresh filesystem/anchor state."""
+    _fs_cache_clear()
+    _ANCHOR_CACHE.clear()
+    _clear_material_users()
+    clear_build_cache()
+    _PEEK_CACHE.clear()
+    _IMAGE_CACHE.clear()
+    _SMP_NODE_IDX.clear()
+    _EM_APPLIED.clear()
+    _EMIS_FP.clear()
+    _NIF_EMISSIVE.clear()
+    _ALPHA_FP.clear()
+    _SOFT_ALPHA_CACHE.clear()
+    _read_nif_bytes.cache_clear()
+    _parse_nif_alpha_cached.cache_clear()
+
+
 # ---------------------------------------------------------------------------
 # Labels for nodes
 # ---------------------------------------------------------------------------
@@ -291,54 +422,198 @@ LBL_AO_MIX, LBL_AO_STRENGTH = "AO Mix (Multiply)", "AO Strength (fac)"
 LBL_SPEC, LBL_PARALLAX_M = "Specular", "Parallax (_m)"
 LBL_EM_TINT = "Emissive Tint (Multiply)"
 LBL_EM_STRENGTH = "Emission Strength"  # ← add this line
+LBL_COMBINE_NORM = "Combine RGB (Normal)"
+LBL_SKYRIM_SHADER = "Skyrim Shader"
+
+# Skyrim unified layout (pixel-matched to the reference), keyed by node label
+_LAYOUT_POSITIONS = {
+    # Left column (textures)
+    "Base": (-1700, 650),
+    "RMAOS": (-1700, 350),
+    "Normal": (-1700, 50),
+    "Emissive": (-1700, -250),
+    "Parallax": (-1700, -550),
+    # Top band (AO / roughness / metal)
+    "AO Mix (Multiply)": (-1400, 600),
+    "Roughness Invert": (-1200, 600),
+    "Mix": (-1000, 600),
+    "Roughness Control": (-800, 600),
+    "Metallic Control": (-800, 500),
+    # Middle band (RMAOS logic)
+    "RMAOS Separate": (-1400, 350),
+    "Subtract": (-1200, 320),
+    "Combine RGB (Legacy)": (-1000, 350),
+    # Middle-lower band (normal logic)
+    "Separate RGB (Legacy)": (-1400, 50),
+    "Subtract (Normal)": (-1200, 20),
+    LBL_COMBINE_NORM: (-1000, 30),
+    "Normal Flip Switch": (-800, 40),
+    "Normal Map": (-600, 40),
+    # Bottom band (emissive)
+    "Emissive Color (fallback)": (-1100, -150),
+    "Emissive Tint (Multiply)": (-800, -150),
+    # Right side (shader/output)
+    "Principled BSDF": (-200, 180),
+    "Displacement": (-200, -220),
+    "Material Output": (200, 180),
+}
 
 
 # ---------------------------------------------------------------------------
 # Property Group (live controls)
 # ---------------------------------------------------------------------------
-def _update_math_input(mat, label, idx, value):
-    if not mat or not mat.node_tree:
+# mat.name_full -> (node count, {label: node name}); first node wins per label
+_LABEL_CACHE: Dict[str, Tuple[int, Dict[str, str]]] = {}
+# Custom property holding {label: node name}, written when the graph is built
+KEY_NODE_MAP = "_skpbr_nodes"
+
+
+def _node_label_map(nodes) -> Dict[str, str]:
+    idx = {}
+    for n in nodes:
+        if n.label:
+            idx.setdefault(n.label, n.name)
+    return idx
+
+
+def _store_node_map(mat, idx=None):
+    """Persist the label -> node name map on the material (called after a build)."""
+    if idx is None:
+        idx = _node_label_map(mat.node_tree.nodes)
+        _LABEL_CACHE[mat.name_full] = (len(mat.node_tree.nodes), idx)
+    try:
+        mat[KEY_NODE_MAP] = idx
+    except Exception:
+        pass
+
+
+# mat.name_full of materials whose saved map is missing/stale; _label_node runs from
+# draw(), where ID writes are blocked, so the write-back happens on a timer tick
+_NODE_MAP_PENDING: set = set()
+
+
+def _flush_node_maps():
+    names = list(_NODE_MAP_PENDING)
+    _NODE_MAP_PENDING.clear()
+    for name in names:
+        mat = bpy.data.materials.get(name)
+        entry = _LABEL_CACHE.get(name)
+        if mat is None or entry is None or not mat.node_tree:
+            continue
+        if entry[0] == len(mat.node_tree.nodes):
+            _store_node_map(mat, entry[1])
+    return None
+
+
+def _queue_node_map_store(mat):
+    if mat.library is not None:
+        return  # linked materials are read-only; the in-memory index has to do
+    if bpy.app.background:
+        _store_node_map(mat, _LABEL_CACHE[mat.name_full][1])
         return
-    for n in mat.node_tree.nodes:
-        if getattr(n, "label", "") == label:
-            try:
-                n.inputs[idx].default_value = value
-            except Exception:
-                pass
-            break
+    _NODE_MAP_PENDING.add(mat.name_full)
+    if not bpy.app.timers.is_registered(_flush_node_maps):
+        bpy.app.timers.register(_flush_node_maps, first_interval=0.0)
+
+
+def _label_node(mat, label):
+    """Return the first node in mat's tree with this label, via the saved name map."""
+    nodes = mat.node_tree.nodes
+    # Builder-made nodes are named after their label
+    n = nodes.get(label)
+    if n is not None and n.label == label:
+        return n
+    saved = mat.get(KEY_NODE_MAP)
+    if saved is not None:
+        name = saved.get(label)
+        n = nodes.get(name) if name else None
+        if n is not None and n.label == label:
+            return n
+
+    count = len(nodes)
+    entry = _LABEL_CACHE.get(mat.name_full)
+    if entry is None or entry[0] != count:
+        entry = (count, _node_label_map(nodes))
+        _LABEL_CACHE[mat.name_full] = entry
+    name = entry[1].get(label)
+    n = nodes.get(name) if name else None
+    if n is not None and n.label == label:
+        _queue_node_map_store(mat)  # saved map was missing or stale
+        return n
+    if name is not None:
+        # Relabelled/renamed without a count change; drop the stale index and rescan once
+        _LABEL_CACHE.pop(mat.name_full, None)
+        return _label_node(mat, label)
+    return None
 
 
-def _update_socket(mat, label, name, value):
+# Slider drags fire many updates per second. The first change writes straight through
+# (so a single edit lands before its undo push) and opens a short window; repeats inside
+# it queue the latest value per socket and are written from one timer tick.
+# Key: (mat name, label, "in"/"out", socket) -> value
+_PENDING: Dict[tuple, object] = {}
+_FLUSH_INTERVAL = 0.016
+
+
+def _write_node_value(mat, label, kind, key, value):
     if not mat or not mat.node_tree:
         return
-    for n in mat.node_tree.nodes:
-        if getattr(n, "label", "") == label and name in n.inputs:
-            try:
-                n.inputs[name].default_value = value
-            except Exception:
-                pass
-            break
+    n = _label_node(mat, label)
+    if not n:
+        return
+    socks = n.inputs if kind == "in" else n.outputs
+    if isinstance(key, str):
+        sock = socks.get(key)
+    else:
+        sock = socks[key] if 0 <= key < len(socks) else None
+    if sock is not None and hasattr(sock, "default_value"):
+        sock.default_value = value
 
 
-def _update_rgb(mat, label, value):
+def _flush_pending():
+    pending = list(_PENDING.items())
+    _PENDING.clear()
+    for (mat_name, label, kind, key), value in pending:
+        _write_node_value(bpy.data.materials.get(mat_name), label, kind, key, value)
+    return None
+
+
+def _queue_node_value(mat, label, kind, key, value):
     if not mat or not mat.node_tree:
         return
-    for n in mat.node_tree.nodes:
-        if getattr(n, "label", "") == label:
-            try:
-                n.outputs[0].default_value = value
-            except Exception:
-                pass
-            break
+    if hasattr(value, "__len__"):
+        value = tuple(value)
+    if bpy.app.background:
+        # No event loop to run timers; write straight through
+        _write_node_value(mat, label, kind, key, value)
+        return
+    if bpy.app.timers.is_registered(_flush_pending):
+        _PENDING[(mat.name, label, kind, key)] = value
+        return
+    _write_node_value(mat, label, kind, key, value)
+    bpy.app.timers.register(_flush_pending, first_interval=_FLUSH_INTERVAL)
+
+
+def _update_math_input(mat, label, idx, value):
+    _queue_node_value(mat, label, "in", idx, value)
+
+
+def _update_socket(mat, label, name, value):
+    _queue_node_value(mat, label, "in", name, value)
+
+
+def _update_rgb(mat, label, value):
+    _queue_node_value(mat, label, "out", 0, value)
 
 
 def _update_flip_norm(self, ctx):
     mat = self.id_data
     if not mat or not mat.node_tree:
         return
-    for n in mat.node_tree.nodes:
-        if getattr(n, "label", "") == "Normal Flip Switch":
-            n.inputs["Fac"].default_value = 1.0 if self.flip_norm_y else 0.0
+    n = _label_node(mat, "Normal Flip Switch")
+    sock = n.inputs.get("Fac") if n else None
+    if sock is not None:
+        sock.default_value = 1.0 if self.flip_norm_y else 0.0
 
 
 class SKPBR_PG_Settings(bpy.types.PropertyGroup):
@@ -347,60 +622,28 @@ class SKPBR_PG_Settings(bpy.types.PropertyGroup):
             self.pg_use_parallax_m = self.use_parallax_m
         return None
 
-    def _v205_update_emission(self, context):
-        mat = getattr(self, "id_data", None)
-        if not mat:
-            return
-        try:
-            _v205_emission_ensure_chain(mat, force_on=self.emission_on)
-            _v205_emission_live(mat)
-        except Exception as e:
-            print("[SMP v205] live emission update failed:", e)
-
-    def _smp_update_emission_v202(self, context):
-        mat = getattr(self, "id_data", None)
-        if not mat:
-            return
-        try:
-            _smp_ensure_emission_chain_optionA(mat, force_on=self.emission_on)
-            _smp_apply_emission_live_optionA(mat)
-        except Exception as e:
-            print("[SMP_v202] emission live update error:", e)
-
+    # --- Emissive controls (smart toggle) ---
+    # Every emissive property funnels into one _emission_refresh(); the auto-toggle
+    # writes below happen under the sync guard so they don't refresh a second time.
     def _smp_update_emission(self, context):
-        mat = getattr(self, "id_data", None)
-        if not mat:
-            return
-        try:
-            _ensure_emissive_chain(mat)
-        except Exception:
-            pass
-        try:
-            _emissive_apply_to_nodes(mat)
-        except Exception:
-            pass
+        _emission_refresh(self.id_data)
 
-    # --- Emissive controls (smart toggle) ---
     def _update_emission_strength(self, context):
-        try:
-            _emissive_apply_to_nodes(self.id_data)
-        except Exception:
-            pass
-        try:
-            self.emission_on = bool(self.emission_strength > 0.0)
-        except Exception:
-            pass
+        on = bool(self.emission_strength > 0.0)
+        if not _SMP_PROP_SYNC_GUARD and self.emission_on != on:
+            with _prop_sync_guard():
+                self.emission_on = on
+        _emission_refresh(self.id_data)
 
     def _update_emission_on(self, context):
-        try:
-            _emissive_apply_to_nodes(self.id_data)
-        except Exception:
-            pass
-        try:
-            if self.emission_on and self.emission_strength <= 0.0:
+        if (
+            not _SMP_PROP_SYNC_GUARD
+            and self.emission_on
+            and self.emission_strength <= 0.0
+        ):
+            with _prop_sync_guard():
                 self.emission_strength = 1.0
-        except Exception:
-            pass
+        _emission_refresh(self.id_data)
 
     emission_on: bpy.props.BoolProperty(
         name="Emission",
@@ -543,218 +786,12 @@ class SKPBR_PG_Settings(bpy.types.PropertyGroup):
 # ---------------------------------------------------------------------------
 # Texture resolution helpers
 # ---------------------------------------------------------------------------
-KNOWN_SUFFIXES = [
-    "_d",
-    "_n",
-    "_rmaos",
-    "_p",
-    "_e",
-    "_em",
-    "_g",
-    "_orm",
-    "_m",
-    "_s",
-    "_spec",
-    "_specular",
-]
-
-
-def _is_diffuse_like(path: Path) -> bool:
-    """Heuristic: treat files without known suffix OR ending in _d as diffuse/base."""
-    st = path.stem.lower()
-    # Accept "name.dds" and "name_d.dds"
-    if any(
-        st.endswith(suf) for suf in ["_n", "_rmaos", "_orm", "_p", "_e", "_em", "_g"]
-    ):
-        return False
-    return True
-
-
-def _determine_base_diffuse(anchor: Path, prefs: "SKPBR_Prefs") -> Optional[Path]:
-    """Pick the base diffuse to anchor the set. Prefer explicit diffuse files."""
-    stem = _strip_known_suffixes(anchor.stem)
-    base_dir = anchor.parent
-    # If manual root is set in MANUAL mode, search there first
-    search_dirs = []
-    if prefs.search_mode == "MANUAL" and prefs.manual_root:
-        mr = Path(prefs.manual_root)
-        if mr.is_dir():
-            search_dirs.append(mr)
-    # Always include the anchor's directory as a fallback
-    if base_dir not in search_dirs:
-        search_dirs.append(base_dir)
-
-    candidates = [f"{stem}.dds", f"{stem}_d.dds"]
-
-    for d in search_dirs:
-        for nm in candidates:
-            p = d / nm
-            if p.is_file():
-                return p
-
-    # If nothing found, accept the anchor itself if it looks like a diffuse/base
-    try:
-        if _is_diffuse_like(anchor):
-            return anchor
-    except Exception:
-        pass
-    return None
-
-
-def _gather_strict_set(
-    base_diffuse: Path, prefs: "SKPBR_Prefs"
-) -> Dict[str, Optional[Path]]:
-    """Gather only maps with the same base stem as the diffuse. Search manual root first if set."""
-    stem = _strip_known_suffixes(base_diffuse.stem)
-    base_dir = base_diffuse.parent
-
-    search_dirs = []
-    if prefs.search_mode == "MANUAL" and prefs.manual_root:
-        mr = Path(prefs.manual_root)
-        if mr.is_dir():
-            search_dirs.append(mr)
-    if base_dir not in search_dirs:
-        search_dirs.append(base_dir)
-
-    wants = {
-        "BASE": [f"{stem}.dds", f"{stem}_d.dds"],
-        "NORMAL": [f"{stem}_n.dds"],
-        "RMAOS": [f"{stem}_rmaos.dds", f"{stem}_orm.dds"],
-        "PARALLAX": [f"{stem}_p.dds"],
-        "EMISSIVE": [f"{stem}_em.dds", f"{stem}_e.dds", f"{stem}_g.dds"],
-    }
-    out = {k: None for k in wants}
-
-    # BASE is the provided diffuse, ensure it is set
-    out["BASE"] = base_diffuse if base_diffuse.is_file() else None
-
-    for k, names in wants.items():
-        if k == "BASE":
-            continue
-        found = None
-        for d in search_dirs:
-            for nm in names:
-                p = d / nm
-                if p.is_file():
-                    found = p
-                    break
-            if found:
-                break
-        out[k] = found
-    return out
-
-
-def _strip_known_suffixes(stem: str) -> str:
-    low = stem.lower()
-    for s in KNOWN_SUFFIXES:
-        if low.endswith(s):
-            return stem[: -len(s)]
-    return stem
-
-
-def _gather_from_dir(base_dir: Path, stem: str) -> Dict[str, Optional[Path]]:
-    candidates = {
-        "BASE": [f"{stem}.dds", f"{stem}_d.dds"],
-        "NORMAL": [f"{stem}_n.dds"],
-        "RMAOS": [f"{stem}_rmaos.dds", f"{stem}_orm.dds"],
-        "PARALLAX": [f"{stem}_p.dds"],
-        "EMISSIVE": [f"{stem}_em.dds", f"{stem}_e.dds", f"{stem}_g.dds"],
-    }
-    out = {k: None for k in candidates}
-    for k, names in candidates.items():
-        for nm in names:
-            p = base_dir / nm
-            if p.is_file():
-                out[k] = p
-                break
-    return out
-
-
-def _resolve_textures_for_anchor(
-    anchor: Path, prefs: "SKPBR_Prefs"
-) -> Dict[str, Optional[Path]]:
-    """Resolve textures by first determining the base diffuse, then gathering only matching stems."""
-    base = _determine_base_diffuse(anchor, prefs)
-    if not base:
-        # Fallback: use original behavior for BASE only
-        # (keeps compatibility if user anchors to a non-diffuse image with no real base on disk)
-        base = anchor
-    return _gather_strict_set(base, prefs)
-    return _gather_from_dir(base_dir, stem)
-
-
-def _classify_m_map(path: Path) -> str:
-    """
-    Classify _m.dds as 'dummy' (black), 'mask' (low variance), or 'height' (high detail).
-    """
-    try:
-        import bpy
-
-        img = bpy.data.images.load(str(path), check_existing=True)
-    except Exception:
-        return "mask"
-    try:
-        if not getattr(img, "has_data", True):
-            img.reload()
-        px = img.pixels
-        if not px or len(px) < 4:
-            return "mask"
-        step = max(1, int((len(px) // 4) // 2048))
-        samps = [px[i * 4] for i in range(0, (len(px) // 4), step)]
-        avg = sum(samps) / len(samps)
-        var = sum((v - avg) ** 2 for v in samps) / len(samps)
-        if avg < 0.02 and var < 1e-6:
-            return "dummy"
-        if var < 0.005:
-            return "mask"
-        return "height"
-    except Exception:
-        return "mask"
-    finally:
-        try:
-            if img.users == 0:
-                bpy.data.images.remove(img)
-        except Exception:
-            pass
-
-
-def _detect_pbr(textures: Dict[str, Optional[Path]]) -> bool:
-    """Only treat as PBR if a valid RMAOS/ORM map exists with the same stem as the base diffuse."""
-    base = textures.get("BASE")
-    if not base or not base.is_file():
-        return False
-    stem = _strip_known_suffixes(base.stem).lower()
-
-    p = textures.get("RMAOS")
-    if p and p.is_file() and _strip_known_suffixes(p.stem).lower() == stem:
-        return True
-    return False
-    stem = _strip_known_suffixes(base.stem).lower()
-
-    def valid_map(key):
-        p = textures.get(key)
-        if not p or not p.is_file():
-            return False
-        pstem = _strip_known_suffixes(p.stem).lower()
-        # Ignore legacy "_m" envmaps
-        if p.stem.lower().endswith("_m"):
-            return False
-        return pstem == stem
-
-    # Require RMAOS or PARALLAX specifically
-    if valid_map("RMAOS") or valid_map("PARALLAX"):
-        return True
-    # Emissive alone shouldn't force PBR
-    return False
-    stem = _strip_known_suffixes(base.stem).lower()
-    for key in ("RMAOS", "PARALLAX", "EMISSIVE"):
-        p = textures.get(key)
-        if p and _strip_known_suffixes(p.stem).lower() == stem:
-            return True
-    return False
-    return bool(
-        textures.get("RMAOS") or textures.get("PARALLAX") or textures.get("EMISSIVE")
-    )
+from ._hotpath import (
+    _detect_pbr,
+    _fs_cache_clear,
+    _is_file_cached,
+    _resolve_textures_for_anchor,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -783,11 +820,10 @@ def _apply_json_overrides(
                 break
 
 
-def _apply_json_settings(mat: bpy.types.Material, entry: dict):
-    if not mat or not hasattr(mat, "skpbr") or not entry:
-        return
-    s = mat.skpbr
-    scalar = (
+# JSON key -> (accepted JSON types, coercion) for plain mat.skpbr settings
+_JSON_SETTERS = {
+    k: ((int, float), float)
+    for k in (
         "rough_mult",
         "metal_mult",
         "normal_strength",
@@ -797,19 +833,21 @@ def _apply_json_settings(mat: bpy.types.Material, entry: dict):
         "ao_strength",
         "alpha_strength",
     )
-    flags = ("flip_norm_y", "invert_roughness", "force_build")
-    for k in scalar:
-        if k in entry and isinstance(entry[k], (int, float)):
-            try:
-                setattr(s, k, float(entry[k]))
-            except Exception as e:
-                _log(f"JSON setting '{k}' failed: {e}")
-    for k in flags:
-        if k in entry and isinstance(entry[k], bool):
-            try:
-                setattr(s, k, bool(entry[k]))
-            except Exception as e:
-                _log(f"JSON setting '{k}' failed: {e}")
+} | {k: (bool, bool) for k in ("flip_norm_y", "invert_roughness", "force_build")}
+
+
+def _apply_json_settings(mat: bpy.types.Material, entry: dict):
+    if not mat or not hasattr(mat, "skpbr") or not entry:
+        return
+    s = mat.skpbr
+    for k, v in entry.items():
+        spec = _JSON_SETTERS.get(k)
+        if spec is None or not isinstance(v, spec[0]):
+            continue
+        try:
+            setattr(s, k, spec[1](v))
+        except Exception as e:
+            _log(f"JSON setting '{k}' failed: {e}")
     if (
         "emissive_color" in entry
         and isinstance(entry["emissive_color"], (list, tuple))
@@ -845,187 +883,55 @@ def _extract_base_from_json(entry: Optional[dict], json_dir: Path) -> Optional[P
 # ============================================================
 
 
-def _pynifly_suggests_emissive(obj: bpy.types.Object) -> bool:
-    """
-    Best-effort fallback when numeric emissives aren't found:
-    if the imported NIF (via PyNifly) shows any glow/emissive texture slot,
-    we'll enable emission with safe defaults.
-    """
-    try:
-        data = getattr(obj.data, "nif_blocks", None)
-        if not data:
-            return False
-        for blk in data:
-            # look for texture arrays commonly exposed by PyNifly
-            for attr in ("textures", "tex", "texture_paths"):
-                texs = getattr(blk, attr, None)
-                if not texs:
-                    continue
-                for t in texs:
-                    if not isinstance(t, str):
-                        continue
-                    low = t.lower()
-                    if (
-                        low.endswith("_g.dds")
-                        or low.endswith("_em.dds")
-                        or low.endswith("_e.dds")
-                    ):
-                        return True
-        return False
-    except Exception:
-        return False
+_NIF_SUFFIX = ".nif"
+# Shader flag custom props (PyNifly spellings) and the tokens that mean "emits"
+_FLAG_KEYS_1 = ("shader_flags_1", "Shader_Flags_1", "BSLighting_Shader_Flags_1")
+_FLAG_KEYS_2 = ("shader_flags_2", "Shader_Flags_2", "BSLighting_Shader_Flags_2")
+_EMIT_FLAG_TOKENS = (
+    "OWN_EMIT",
+    "EXTERNAL_EMITTANCE",
+    "GLOW",
+    "SOFT_LIGHTING",
+    "EFFECT_LIGHTING",
+)
+_EMIT_FLAG_RE = re.compile("|".join(_EMIT_FLAG_TOKENS))
 
 
-def _extract_emissive_from_nif_for_object(obj: bpy.types.Object) -> Optional[dict]:
-    """
-    Resolve a NIF path for this object using:
-      1. obj["nif_path"] if present
-      2. the SMP 'remember_anchor' path (skpbr_last_vfs, skpbr_last_manual, etc.)
-    and load emissive data using the VFS layer if available.
-    """
-    try:
-        nif_path = getattr(obj, "nif_path", None)
+# mat.name_full -> name of the first scene mesh object using it; rebuilt in one pass
+# whenever the object/material counts or the active scene change
+_MAT_USER_CACHE: Dict[str, str] = {}
+_MAT_USER_CACHE_STAMP = None
 
-        # --- Fallback 1: look in custom props for a .nif path
-        if not nif_path:
-            for k in getattr(obj, "keys", lambda: [])():
-                try:
-                    v = str(obj[k])
-                except Exception:
-                    continue
-                if v.lower().endswith(".nif"):
-                    nif_path = v
-                    break
-
-        # --- Fallback 2: use remembered anchors (VFS-aware)
-        if not nif_path:
-            mat = None
-            if hasattr(obj, "active_material") and obj.active_material:
-                mat = obj.active_material
-            elif obj.material_slots and obj.material_slots[0].material:
-                mat = obj.material_slots[0].material
-
-            if mat:
-                for key in (
-                    "skpbr_last_vfs",
-                    "skpbr_last_manual",
-                    "skpbr_last_sibling",
-                ):
-                    if key in mat:
-                        anchor = Path(mat[key])
-                        base_dir = anchor.parent
-
-                        # Look for matching nif beside the texture under VFS
-                        for guess in [
-                            base_dir / f"{obj.name.split(':')[0]}.nif",
-                            base_dir.with_name("meshes")
-                            / f"{obj.name.split(':')[0]}.nif",
-                        ]:
-                            if _smp_vfs_exists(str(guess)):
-                                nif_path = str(guess)
-                                break
-                        if nif_path:
-                            break
-
-        if not nif_path:
-            return None
-
-        # --- Use VFS to read file content
-        if _smp_vfs_exists(nif_path):
-            with _smp_open(nif_path, "rb") as f:
-                data = f.read()
-            info = nifparser.parse_nif_emissives(
-                data, match_name=getattr(obj, "name", None)
-            )
-        elif os.path.exists(nif_path):
-            info = nifparser.parse_nif_emissives(
-                nif_path, match_name=getattr(obj, "name", None)
-            )
-        else:
-            return None
 
-        if not info:
-            return None
+def _clear_material_users():
+    global _MAT_USER_CACHE_STAMP
+    _MAT_USER_CACHE.clear()
+    _MAT_USER_CACHE_STAMP = None
 
-        col = tuple(info.get("em_color", (0.0, 0.0, 0.0)))
-        mul = float(info.get("em_strength", 0.0))
-        return {"color": col, "strength": mul}
 
-    except Exception as e:
-        _log(f"[SkyrimPatcher DEBUG] VFS emissive extract failed for {obj.name}: {e}")
+def _material_user(mat, scene=None, _rescanned=False):
+    """First mesh object in the scene that has mat in one of its slots (or None)."""
+    global _MAT_USER_CACHE_STAMP
+    scene = scene or bpy.context.scene
+    if scene is None:
         return None
-
-
-def _init_emissive_from_nif(mat: bpy.types.Material):
-    """
-    Called at the start of build_nodes_unified().
-    Finds the first object that uses this material, attempts to read emissive
-    color/strength from its source NIF (per-part match by object name), and
-    writes values to both the UI (mat.skpbr.*) and the BSDF node.
-    Fallback: if no numeric emissive found but a glow map is detected via
-    PyNifly's imported data, enable emissive with (1,1,1) × 1.0.
-    """
-    try:
-        # locate a mesh object that uses this material
-        user_obj = None
-        for ob in bpy.data.objects:
+    stamp = (scene.as_pointer(), len(bpy.data.objects), len(bpy.data.materials))
+    if stamp != _MAT_USER_CACHE_STAMP or _rescanned:
+        _MAT_USER_CACHE.clear()
+        for ob in scene.objects:
             if ob.type != "MESH":
                 continue
             for slot in ob.material_slots:
-                if slot.material is mat:
-                    user_obj = ob
-                    break
-            if user_obj:
-                break
-
-        if not user_obj or not hasattr(mat, "skpbr"):
-            return
-
-        # 1) primary: numeric emissive via PyFFI
-        info = _extract_emissive_from_nif_for_object(user_obj)
-        if info:
-            mat.skpbr.emission_color = info["color"]
-            mat.skpbr.emission_strength = info["strength"]
-            mat.skpbr.emission_on = info["strength"] > 0.0
-            _log(
-                f"[SkyrimPatcher DEBUG] Emissive applied from NIF for {mat.name}: "
-                f"color={info['color']} × {info['strength']}"
-            )
-            _apply_nif_emissive_to_bsdf_if_flag(mat)
-            # Force panel redraw so UI sliders reflect new NIF emissive
-            try:
-                import bpy
-
-                for window in bpy.context.window_manager.windows:
-                    for area in window.screen.areas:
-                        if area.type == "PROPERTIES":
-                            area.tag_redraw()
-            except Exception as e:
-                _log(f"[SMP] emissive UI redraw failed: {e}")
-
-            return
-
-        # 2) fallback: flags/texture hint via PyNifly import → white × 1.0
-        if _pynifly_suggests_emissive(user_obj):
-            mat.skpbr.emission_color = (1.0, 1.0, 1.0)
-            mat.skpbr.emission_strength = 1.0
-            mat.skpbr.emission_on = True
-            _log(
-                f"[SkyrimPatcher DEBUG] Emissive fallback (flags/texture hint) for {mat.name}: "
-                f"color=(1,1,1) × 1.0"
-            )
-            _apply_nif_emissive_to_bsdf_if_flag(mat)
-            return
-
-        # 3) nothing found → keep emission OFF/0.0
-        _log(
-            f"[SkyrimPatcher DEBUG] No emissive found for {mat.name}; leaving emission off."
-        )
-
-    except Exception as e:
-        _log(
-            f"[SkyrimPatcher DEBUG] _init_emissive_from_nif failed for {mat.name}: {e}"
-        )
+                m = slot.material
+                if m is not None:
+                    _MAT_USER_CACHE.setdefault(m.name_full, ob.name)
+        _MAT_USER_CACHE_STAMP = stamp
+    name = _MAT_USER_CACHE.get(mat.name_full)
+    ob = scene.objects.get(name) if name else None
+    if ob is not None and ob.material_slots.find(mat.name) < 0:
+        # Slots were reassigned without changing any counts; rescan once
+        return None if _rescanned else _material_user(mat, scene, True)
+    return ob
 
 
 # ---------------------------------------------------------------------------
@@ -1034,7 +940,16 @@ def _init_emissive_from_nif(mat: bpy.types.Material):
 
 
 # --- Emissive chain helpers (Skyrim-accurate) ---
-def _find_node_by_label(nt, label):
+def _is_skyrim_shader(n) -> bool:
+    """PyNifly's vanilla shader group; matched by our label or by its node name."""
+    if n.label == LBL_SKYRIM_SHADER:
+        return True
+    return n.type == "GROUP" and LBL_SKYRIM_SHADER in n.name
+
+
+def _find_node_by_label(nt, label, index=None):
+    if index is not None:
+        return index.get(label)
     for n in nt.nodes:
         if getattr(n, "label", "") == label:
             return n
@@ -1051,6 +966,31 @@ def _ensure_emissive_chain(mat):
 # ============================================================
 
 
+# Custom property holding the branch signature of the last unified build
+KEY_BUILD_SIG = "_skpbr_sig"
+# Custom property holding the full input signature (mode + texture paths) of that build
+KEY_LAST_SIG = "_skpbr_last_sig"
+# mat.name_full of materials built during the current operator run; every operator
+# that builds starts with _reset_build_caches(), which empties it
+_BUILT_MATS: set = set()
+
+
+def _textures_sig(is_pbr, textures) -> str:
+    items = tuple(sorted((k, str(v) if v else None) for k, v in textures.items()))
+    return repr((bool(is_pbr), items))
+
+
+def clear_build_cache():
+    """Forget which materials were built this run, so the next build of each runs in full."""
+    _BUILT_MATS.clear()
+
+
+def _build_signature(is_pbr, has_rmaos, has_emissive, has_parallax) -> str:
+    """Equal signatures mean build_nodes_unified creates the same set of nodes."""
+    flags = (is_pbr, is_pbr and has_rmaos, has_emissive, has_parallax)
+    return "".join("1" if f else "0" for f in flags)
+
+
 def build_nodes_unified(
     mat: bpy.types.Material, textures: Dict[str, Optional[Path]], is_pbr: bool = True
 ):
@@ -1060,6 +1000,10 @@ def build_nodes_unified(
     - In Vanilla mode, skips RMAOS/Metallic/Roughness links.
     - All other behavior identical (alpha, emissive, parallax, UI sync).
     """
+    # Objects sharing a material reach here once each; build it once per run
+    last_sig = _textures_sig(is_pbr, textures)
+    if mat.name_full in _BUILT_MATS and mat.get(KEY_LAST_SIG) == last_sig:
+        return
 
     try:
         _init_emissive_from_nif(mat)
@@ -1071,7 +1015,12 @@ def build_nodes_unified(
     try:
         if mat.node_tree:
             for n in mat.node_tree.nodes:
-                if "Skyrim Shader" in n.name:
+                t = n.type
+                if t == "EMISSION":
+                    prev_em_color = tuple(n.inputs["Color"].default_value[:3])
+                    prev_em_strength = n.inputs["Strength"].default_value
+                    break
+                if t == "GROUP" and _is_skyrim_shader(n):
                     prev_em_color = (
                         tuple(n.inputs.get("Emission Color", None).default_value[:3])
                         if "Emission Color" in n.inputs
@@ -1083,30 +1032,49 @@ def build_nodes_unified(
                         else None
                     )
                     break
-                elif n.type == "EMISSION":
-                    prev_em_color = tuple(n.inputs["Color"].default_value[:3])
-                    prev_em_strength = n.inputs["Strength"].default_value
-                    break
     except Exception as e:
         _log(f"[UnifiedBuilder] emissive preservation check failed: {e}")
 
     mat.use_nodes = True
     nt = mat.node_tree
-    nt.nodes.clear()
+    _bump_tree_version(nt)
     nodes, links = nt.nodes, nt.links
-
-    _log(f"[UnifiedBuilder] Starting unified build for {mat.name} (is_pbr={is_pbr})")
-
-    n_base = nodes.new("ShaderNodeTexImage")
-    n_base.label = LBL_BASE
-    n_rma = nodes.new("ShaderNodeTexImage")
-    n_rma.label = LBL_RMAOS
-    n_norm = nodes.new("ShaderNodeTexImage")
-    n_norm.label = LBL_NORMAL
-    n_em = nodes.new("ShaderNodeTexImage")
-    n_em.label = LBL_EMISSIVE
-    n_para = nodes.new("ShaderNodeTexImage")
-    n_para.label = LBL_PARALLAX
+    _new_node, _link = nodes.new, links.new
+
+    # Same branch set as the last build: keep its nodes and only create what's missing
+    sig = _build_signature(
+        is_pbr,
+        bool(textures.get("RMAOS")),
+        bool(textures.get("EMISSIVE")),
+        bool(textures.get("PARALLAX")),
+    )
+    reuse = mat.get(KEY_BUILD_SIG) == sig
+    existing = {}
+    if reuse:
+        for n in nodes:
+            existing.setdefault((n.bl_idname, n.label), n)
+    else:
+        nodes.clear()
+    built = {}  # label -> node for this build, first wins
+    touched = set()
+
+    def _node(bl_idname, label):
+        n = existing.pop((bl_idname, label), None)
+        if n is None:
+            n = _new_node(bl_idname)
+            n.label = label
+            n.name = label  # lets _label_node hit nodes.get(label) directly
+        built.setdefault(label, n)
+        touched.add(n.name)
+        return n
+
+    _logd("[UnifiedBuilder] Starting unified build for %s (is_pbr=%s)", mat.name, is_pbr)
+
+    n_base = _node("ShaderNodeTexImage", LBL_BASE)
+    n_rma = _node("ShaderNodeTexImage", LBL_RMAOS)
+    n_norm = _node("ShaderNodeTexImage", LBL_NORMAL)
+    n_em = _node("ShaderNodeTexImage", LBL_EMISSIVE)
+    n_para = _node("ShaderNodeTexImage", LBL_PARALLAX)
 
     _load_image(n_base, textures.get("BASE"), "sRGB")
     _load_image(n_rma, textures.get("RMAOS"), "Non-Color")
@@ -1115,199 +1083,121 @@ def build_nodes_unified(
     _load_image(n_para, textures.get("PARALLAX"), "Non-Color")
 
     if is_pbr and textures.get("RMAOS"):
-        n_sep = nodes.new("ShaderNodeSeparateColor")
-        n_sep.label = LBL_SEP
-        links.new(n_rma.outputs["Color"], n_sep.inputs["Color"])
-        n_inv = nodes.new("ShaderNodeMath")
+        n_sep = _node("ShaderNodeSeparateColor", LBL_SEP)
+        _link(n_rma.outputs["Color"], n_sep.inputs["Color"])
+        n_inv = _node("ShaderNodeMath", "Roughness Invert")
         n_inv.operation = "SUBTRACT"
         n_inv.inputs[0].default_value = 1.0
-        n_inv.label = "Roughness Invert"
-        links.new(n_sep.outputs["Red"], n_inv.inputs[1])
-        n_rough_switch = nodes.new("ShaderNodeMixRGB")
-        n_rough_switch.label = "Mix"
-        n_rough_switch.label = "Mix"
-        n_rough_inv_val = nodes.new("ShaderNodeValue")
-        n_rough_inv_val.label = LBL_ROUGH_INV
-        links.new(n_sep.outputs["Red"], n_rough_switch.inputs["Color1"])
-        links.new(n_inv.outputs[0], n_rough_switch.inputs["Color2"])
-        links.new(n_rough_inv_val.outputs[0], n_rough_switch.inputs["Fac"])
-        n_mul_r = nodes.new("ShaderNodeMath")
-        n_mul_r.label = LBL_ROUGH_CTL
+        _link(n_sep.outputs["Red"], n_inv.inputs[1])
+        n_rough_switch = _node("ShaderNodeMixRGB", "Mix")
+        n_rough_inv_val = _node("ShaderNodeValue", LBL_ROUGH_INV)
+        _link(n_sep.outputs["Red"], n_rough_switch.inputs["Color1"])
+        _link(n_inv.outputs[0], n_rough_switch.inputs["Color2"])
+        _link(n_rough_inv_val.outputs[0], n_rough_switch.inputs["Fac"])
+        n_mul_r = _node("ShaderNodeMath", LBL_ROUGH_CTL)
         n_mul_r.operation = "MULTIPLY"
-        links.new(n_rough_switch.outputs["Color"], n_mul_r.inputs[0])
-        n_mul_m = nodes.new("ShaderNodeMath")
-        n_mul_m.label = LBL_METAL_CTL
+        _link(n_rough_switch.outputs["Color"], n_mul_r.inputs[0])
+        n_mul_m = _node("ShaderNodeMath", LBL_METAL_CTL)
         n_mul_m.operation = "MULTIPLY"
-        links.new(n_sep.outputs["Green"], n_mul_m.inputs[0])
+        _link(n_sep.outputs["Green"], n_mul_m.inputs[0])
     else:
-        _log(
-            f"[VanillaLayout] Using unified PBR node layout for {mat.name} (skipping RMAOS chain)"
+        _logd(
+            "[VanillaLayout] Using unified PBR node layout for %s (skipping RMAOS chain)",
+            mat.name,
         )
-        n_mul_r = nodes.new("ShaderNodeMath")
-        n_mul_r.label = LBL_ROUGH_CTL
+        n_mul_r = _node("ShaderNodeMath", LBL_ROUGH_CTL)
         n_mul_r.operation = "MULTIPLY"
-        n_mul_m = nodes.new("ShaderNodeMath")
-        n_mul_m.label = LBL_METAL_CTL
+        n_mul_m = _node("ShaderNodeMath", LBL_METAL_CTL)
         n_mul_m.operation = "MULTIPLY"
-        n_rough_inv_val = nodes.new("ShaderNodeValue")
-        n_rough_inv_val.label = LBL_ROUGH_INV
+        n_rough_inv_val = _node("ShaderNodeValue", LBL_ROUGH_INV)
 
-    n_ao_mix = nodes.new("ShaderNodeMixRGB")
-    n_ao_mix.label = LBL_AO_MIX
+    n_ao_mix = _node("ShaderNodeMixRGB", LBL_AO_MIX)
     n_ao_mix.blend_type = "MULTIPLY"
-    links.new(n_base.outputs["Color"], n_ao_mix.inputs["Color1"])
+    _link(n_base.outputs["Color"], n_ao_mix.inputs["Color1"])
 
-    n_sep_norm = nodes.new("ShaderNodeSeparateRGB")
-    n_sep_norm.label = "Separate RGB (Legacy)"
-    links.new(n_norm.outputs["Color"], n_sep_norm.inputs["Image"])
-    n_inv_g = nodes.new("ShaderNodeMath")
+    n_sep_norm = _node("ShaderNodeSeparateRGB", "Separate RGB (Legacy)")
+    _link(n_norm.outputs["Color"], n_sep_norm.inputs["Image"])
+    n_inv_g = _node("ShaderNodeMath", "Subtract (Normal)")
     n_inv_g.operation = "SUBTRACT"
     n_inv_g.inputs[0].default_value = 1.0
-    n_inv_g.label = "Subtract (Normal)"
-    links.new(n_sep_norm.outputs["G"], n_inv_g.inputs[1])
-    n_comb_norm = nodes.new("ShaderNodeCombineRGB")
-    n_comb_norm.label = "Combine RGB (Legacy)"
-    links.new(n_sep_norm.outputs["R"], n_comb_norm.inputs["R"])
-    links.new(n_inv_g.outputs[0], n_comb_norm.inputs["G"])
-    links.new(n_sep_norm.outputs["B"], n_comb_norm.inputs["B"])
-    n_mix_norm = nodes.new("ShaderNodeMixRGB")
-    n_mix_norm.label = "Normal Flip Switch"
-    links.new(n_norm.outputs["Color"], n_mix_norm.inputs["Color1"])
-    links.new(n_comb_norm.outputs["Image"], n_mix_norm.inputs["Color2"])
-    n_nmap = nodes.new("ShaderNodeNormalMap")
-    n_nmap.label = LBL_NORM_MAP
-    links.new(n_mix_norm.outputs["Color"], n_nmap.inputs["Color"])
-
-    n_bsdf = nodes.new("ShaderNodeBsdfPrincipled")
-    n_bsdf.label = LBL_BSDF
-    n_disp = nodes.new("ShaderNodeDisplacement")
-    n_disp.label = LBL_DISP
-    n_out = nodes.new("ShaderNodeOutputMaterial")
-    n_out.label = LBL_OUT
-
-    links.new(n_ao_mix.outputs["Color"], n_bsdf.inputs["Base Color"])
+    _link(n_sep_norm.outputs["G"], n_inv_g.inputs[1])
+    n_comb_norm = _node("ShaderNodeCombineRGB", LBL_COMBINE_NORM)
+    _link(n_sep_norm.outputs["R"], n_comb_norm.inputs["R"])
+    _link(n_inv_g.outputs[0], n_comb_norm.inputs["G"])
+    _link(n_sep_norm.outputs["B"], n_comb_norm.inputs["B"])
+    n_mix_norm = _node("ShaderNodeMixRGB", "Normal Flip Switch")
+    _link(n_norm.outputs["Color"], n_mix_norm.inputs["Color1"])
+    _link(n_comb_norm.outputs["Image"], n_mix_norm.inputs["Color2"])
+    n_nmap = _node("ShaderNodeNormalMap", LBL_NORM_MAP)
+    _link(n_mix_norm.outputs["Color"], n_nmap.inputs["Color"])
+
+    n_bsdf = _node("ShaderNodeBsdfPrincipled", LBL_BSDF)
+    n_disp = _node("ShaderNodeDisplacement", LBL_DISP)
+    n_out = _node("ShaderNodeOutputMaterial", LBL_OUT)
+
+    _link(n_ao_mix.outputs["Color"], n_bsdf.inputs["Base Color"])
     if is_pbr:
-        links.new(n_mul_r.outputs[0], n_bsdf.inputs["Roughness"])
-        links.new(n_mul_m.outputs[0], n_bsdf.inputs["Metallic"])
-    links.new(n_nmap.outputs["Normal"], n_bsdf.inputs["Normal"])
+        _link(n_mul_r.outputs[0], n_bsdf.inputs["Roughness"])
+        _link(n_mul_m.outputs[0], n_bsdf.inputs["Metallic"])
+    _link(n_nmap.outputs["Normal"], n_bsdf.inputs["Normal"])
 
+    # Emission: color wheel always; with a glow map, GlowTex × Color via a multiply tint
+    n_em_rgb = _node("ShaderNodeRGB", LBL_EM_COLOR)
     if n_em.image:
-        links.new(n_em.outputs["Color"], n_bsdf.inputs["Emission Color"])
+        n_em_tint = _node("ShaderNodeMixRGB", LBL_EM_TINT)
+        n_em_tint.blend_type = "MULTIPLY"
+        n_em_tint.inputs["Fac"].default_value = 1.0
+        _link(n_em.outputs["Color"], n_em_tint.inputs["Color1"])
+        _link(n_em_rgb.outputs[0], n_em_tint.inputs["Color2"])
+        _link(n_em_tint.outputs["Color"], n_bsdf.inputs["Emission Color"])
     else:
-        n_em_color = nodes.new("ShaderNodeRGB")
-        n_em_color.label = LBL_EM_COLOR
-        links.new(n_em_color.outputs[0], n_bsdf.inputs["Emission Color"])
+        _link(n_em_rgb.outputs[0], n_bsdf.inputs["Emission Color"])
 
     if n_para.image:
-        links.new(n_para.outputs["Color"], n_disp.inputs["Height"])
-        links.new(n_disp.outputs["Displacement"], n_out.inputs["Displacement"])
+        _link(n_para.outputs["Color"], n_disp.inputs["Height"])
+        _link(n_disp.outputs["Displacement"], n_out.inputs["Displacement"])
 
-    links.new(n_bsdf.outputs["BSDF"], n_out.inputs["Surface"])
+    _link(n_bsdf.outputs["BSDF"], n_out.inputs["Surface"])
     _ensure_emissive_chain(mat)
 
     # --- Alpha connection ---
     try:
         if n_base.image:
-            links.new(n_base.outputs["Alpha"], n_bsdf.inputs["Alpha"])
+            _link(n_base.outputs["Alpha"], n_bsdf.inputs["Alpha"])
     except Exception as e:
         _log(f"[UnifiedBuilder] Alpha connect failed: {e}")
 
-    """Ensures: (GlowTex? × EmissionColorRGB) -> BSDF.Emission Color; Strength from UI."""
-    if not mat or not mat.node_tree:
-        return
-    nt, links = mat.node_tree, mat.node_tree.links
-
-    n_bsdf = _find_node_by_label(nt, LBL_BSDF)
-    if not n_bsdf:
-        return
-
-    # Existing nodes if present
-    n_em_tex = _find_node_by_label(nt, LBL_EMISSIVE)
-    n_em_rgb = _find_node_by_label(nt, LBL_EM_COLOR)
-    n_em_tint = _find_node_by_label(nt, LBL_EM_TINT)
-
-    # Ensure color wheel node exists
-    if not n_em_rgb:
-        try:
-            n_em_rgb = nt.nodes.new("ShaderNodeRGB")
-            n_em_rgb.label = LBL_EM_COLOR
-        except Exception:
-            return
-
-    # If glow texture exists, create multiply tint; else link color directly
-    if n_em_tex and getattr(n_em_tex, "image", None):
-        if not n_em_tint:
-            n_em_tint = nt.nodes.new("ShaderNodeMixRGB")
-            n_em_tint.blend_type = "MULTIPLY"
-            n_em_tint.inputs["Fac"].default_value = 1.0
-            n_em_tint.label = LBL_EM_TINT
-        try:
-            # Wire GlowTex × Color → Emission Color (overwrites previous link)
-            if not n_em_tex.outputs["Color"].is_linked or all(
-                l.to_node != n_em_tint for l in n_em_tex.outputs["Color"].links
-            ):
-                links.new(n_em_tex.outputs["Color"], n_em_tint.inputs["Color1"])
-            if not n_em_rgb.outputs[0].is_linked or all(
-                l.to_node != n_em_tint for l in n_em_rgb.outputs[0].links
-            ):
-                links.new(n_em_rgb.outputs[0], n_em_tint.inputs["Color2"])
-            # Ensure BSDF emission input uses the tint output
-            links.new(n_em_tint.outputs["Color"], n_bsdf.inputs["Emission Color"])
-        except Exception:
-            pass
-    else:
-        try:
-            links.new(n_em_rgb.outputs[0], n_bsdf.inputs["Emission Color"])
-        except Exception:
-            pass
-
-    # --- Skyrim Unified Layout (pixel-matched to your reference) ---
-    layout_positions = {
-        # Left column (textures)
-        "Base": (-1700, 650),
-        "RMAOS": (-1700, 350),
-        "Normal": (-1700, 50),
-        "Emissive": (-1700, -250),
-        "Parallax": (-1700, -550),
-        # Top band (AO / roughness / metal)
-        "AO Mix (Multiply)": (-1400, 600),
-        "Roughness Invert": (-1200, 600),
-        "Mix": (-1000, 600),
-        "Roughness Control": (-800, 600),
-        "Metallic Control": (-800, 500),
-        # Middle band (RMAOS logic)
-        "RMAOS Separate": (-1400, 350),
-        "Subtract": (-1200, 320),
-        "Combine RGB (Legacy)": (-1000, 350),
-        # Middle-lower band (normal logic)
-        "Separate RGB (Legacy)": (-1400, 50),
-        "Subtract (Normal)": (-1200, 20),
-        "Combine RGB (Legacy)": (-1000, 30),
-        "Normal Flip Switch": (-800, 40),
-        "Normal Map": (-600, 40),
-        # Bottom band (emissive)
-        "Emissive Color (fallback)": (-1100, -150),
-        "Emissive Tint (Multiply)": (-800, -150),
-        # Right side (shader/output)
-        "Principled BSDF": (-200, 180),
-        "Displacement": (-200, -220),
-        "Material Output": (200, 180),
-    }
-
-    # --- Apply node layout positions ---
-    for n in nt.nodes:
-        key = getattr(n, "label", None)
-        if key in layout_positions:
-            n.location = layout_positions[key]
-
-    print(f"[UnifiedBuilder] Skyrim-style node layout applied for {mat.name}")
+    # Drop anything a reused tree had that this build didn't ask for
+    if reuse:
+        for n in [n for n in nodes if n.name not in touched]:
+            nodes.remove(n)
+    mat[KEY_LAST_SIG] = last_sig
+    _BUILT_MATS.add(mat.name_full)
+    _EM_APPLIED.pop(mat.name, None)  # node values were just rewritten
+    _EMIS_FP.pop(mat.name, None)
+    _ALPHA_FP.pop(mat.name, None)
+    mat[KEY_BUILD_SIG] = _build_signature(
+        is_pbr,
+        bool(textures.get("RMAOS")),
+        bool(n_em.image),
+        bool(n_para.image),
+    )
 
-    _log(
-        f"[UnifiedBuilder] Build complete for {mat.name} ({'PBR' if is_pbr else 'Vanilla'})"
+    # --- Apply Skyrim unified layout positions (walk the table, not the tree) ---
+    for lbl, loc in _LAYOUT_POSITIONS.items():
+        n = built.get(lbl)
+        if n is not None:
+            n.location = loc
+    _store_node_map(mat)
+
+    _logd("[UnifiedBuilder] Skyrim-style node layout applied for %s", mat.name)
+    _logd(
+        "[UnifiedBuilder] Build complete for %s (%s)",
+        mat.name,
+        "PBR" if is_pbr else "Vanilla",
     )
 
     # Restore or retain emissive values to new BSDF
-    n_bsdf = _find_node_by_label(nt, LBL_BSDF)
     if n_bsdf:
         # Prefer freshly preserved values
         use_color = prev_em_color or getattr(mat.skpbr, "emission_color", (1, 1, 1))
@@ -1326,8 +1216,10 @@ def build_nodes_unified(
         mat.skpbr.emission_strength = use_strength
         mat.skpbr.emission_on = use_strength > 0.0
 
-        _log(
-            f"[UnifiedBuilder] Retained emissive color={use_color}, strength={use_strength}"
+        _logd(
+            "[UnifiedBuilder] Retained emissive color=%s, strength=%s",
+            use_color,
+            use_strength,
         )
 
         try:
@@ -1336,48 +1228,6 @@ def build_nodes_unified(
             pass
 
 
-def _emissive_apply_to_nodes(mat):
-    """Live-sync UI props → nodes (color & strength + smart on/off)."""
-    if not mat or not hasattr(mat, "skpbr") or not mat.node_tree:
-        return
-    s = mat.skpbr
-    nt = mat.node_tree
-
-    # Ensure chain exists before updates
-    _ensure_emissive_chain(mat)
-
-    # Update color wheel
-    n_em_rgb = _find_node_by_label(nt, LBL_EM_COLOR)
-    if n_em_rgb:
-        try:
-            col = s.emission_color if hasattr(s, "emission_color") else (1.0, 1.0, 1.0)
-            r, g, b = float(col[0]), float(col[1]), float(col[2])
-            n_em_rgb.outputs[0].default_value = (r, g, b, 1.0)
-        except Exception:
-            pass
-
-    # Smart toggle: strength > 0 → on; toggle on at 0 → set to 1.0 handled in props
-    n_bsdf = _find_node_by_label(nt, LBL_BSDF)
-    if n_bsdf:
-        try:
-            n_bsdf.inputs["Emission Strength"].default_value = (
-                float(s.emission_strength) if bool(s.emission_on) else 0.0
-            )
-        except Exception:
-            pass
-
-    # Force UI + viewport redraw so emissive values update everywhere
-    try:
-        import bpy
-
-        for window in bpy.context.window_manager.windows:
-            for area in window.screen.areas:
-                if area.type in {"VIEW_3D", "PROPERTIES"}:
-                    area.tag_redraw()
-    except Exception:
-        pass
-
-
 # ============================================================
 # Alpha Mix Update Helper — Keeps transparency slider in sync
 # ============================================================
@@ -1385,14 +1235,35 @@ def _emissive_apply_to_nodes(mat):
 # [AlphaMix removed]
 
 
+# Texture path -> loaded image, so shared textures skip images.load()'s scan of
+# bpy.data.images. Entries are re-checked against bpy.data before reuse.
+# abs path -> (image name, image filepath). Names, not Image wrappers: undo and file
+# load free the datablocks, and touching a stale wrapper can crash Blender
+_IMAGE_CACHE: Dict[str, Tuple[str, str]] = {}
+
+
+def _cached_image(key: str):
+    hit = _IMAGE_CACHE.get(key)
+    if hit is not None:
+        img = bpy.data.images.get(hit[0])
+        if img is not None and img.filepath == hit[1]:
+            return img
+    img = bpy.data.images.load(key, check_existing=True)
+    _IMAGE_CACHE[key] = (img.name, img.filepath)
+    return img
+
+
 def _load_image(
     node: bpy.types.ShaderNodeTexImage, path: Optional[Path], colorspace: str
 ):
     if not path:
+        # A reused node may still hold the previous build's image
+        node.image = None
         return
     try:
-        node.image = bpy.data.images.load(str(path), check_existing=True)
-        node.image.colorspace_settings.name = colorspace
+        img = _cached_image(str(path))
+        node.image = img
+        img.colorspace_settings.name = colorspace
     except Exception as e:
         _log(f"Load fail {node.label}: {e}")
 
@@ -1408,25 +1279,43 @@ class SKPBR_OT_BuildAuto(bpy.types.Operator):
     bl_label = "Build Skyrim PBR"
     bl_options = {"REGISTER", "UNDO"}
 
-    def build_for_material(self, mat: bpy.types.Material, prefs) -> bool:
+    def build_for_material(
+        self,
+        mat: bpy.types.Material,
+        prefs,
+        *,
+        lbl_bsdf=LBL_BSDF,
+        lbl_base=LBL_BASE,
+    ) -> bool:
         """Core builder logic with PyNifly emissive preservation."""
         try:
-            import os
+            sk = getattr(mat, "skpbr", None)
 
             # --- Preserve emissive from current node tree (PyNifly import) ---
             em_color, em_strength = None, None
-            if mat.node_tree:
-                for n in mat.node_tree.nodes:
-                    if isinstance(n, bpy.types.ShaderNodeEmission):
-                        try:
-                            em_color = tuple(n.inputs["Color"].default_value[:3])
-                            em_strength = n.inputs["Strength"].default_value
-                            _log(
-                                f"[SMP] Preserved emissive before rebuild: color={em_color}, strength={em_strength}"
-                            )
-                        except Exception:
-                            pass
-                        break
+            em_node = (
+                next(
+                    (
+                        n
+                        for n in mat.node_tree.nodes
+                        if n.bl_idname == "ShaderNodeEmission"
+                    ),
+                    None,
+                )
+                if mat.node_tree
+                else None
+            )
+            if em_node is not None:
+                try:
+                    em_color = tuple(em_node.inputs["Color"].default_value[:3])
+                    em_strength = em_node.inputs["Strength"].default_value
+                    _logd(
+                        "[SMP] Preserved emissive before rebuild: color=%s, strength=%s",
+                        em_color,
+                        em_strength,
+                    )
+                except Exception:
+                    pass
 
             # --- Build process ---
             if prefs.search_mode == "NIFPATH":
@@ -1439,7 +1328,7 @@ class SKPBR_OT_BuildAuto(bpy.types.Operator):
 
             textures = _resolve_textures_for_anchor(anchor, prefs)
             has_pbr = _detect_pbr(textures)
-            force_pbr = bool(getattr(mat, "skpbr", None) and mat.skpbr.force_build)
+            force_pbr = bool(sk and sk.force_build)
 
             if has_pbr or force_pbr:
                 # Build PBR graph
@@ -1459,13 +1348,11 @@ class SKPBR_OT_BuildAuto(bpy.types.Operator):
             # --- Add transparency nodes for alpha control ---
             try:
                 nt = mat.node_tree
-                nodes, links = nt.nodes, nt.links
+                links = nt.links
 
-                bsdf = _find_node_by_label(nt, LBL_BSDF)
-                base_tex = _find_node_by_label(nt, LBL_BASE)
-                output_node = next(
-                    (n for n in nodes if n.type == "OUTPUT_MATERIAL"), None
-                )
+                bsdf = _label_node(mat, lbl_bsdf)
+                base_tex = _label_node(mat, lbl_base)
+                output_node = nt.get_output_node("EEVEE") or nt.get_output_node("ALL")
 
                 if bsdf and base_tex and output_node:
                     # Ensure Base Color is linked (safe no-op if already)
@@ -1491,26 +1378,27 @@ class SKPBR_OT_BuildAuto(bpy.types.Operator):
 
             # --- Reapply emissive after rebuild ---
             if em_color and em_strength is not None:
-                s = getattr(mat, "skpbr", None)
-                if s:
-                    s.emission_color = em_color
-                    s.emission_strength = em_strength
-                    s.emission_on = em_strength > 0.0
+                if sk:
+                    sk.emission_color = em_color
+                    sk.emission_strength = em_strength
+                    sk.emission_on = em_strength > 0.0
                 _emissive_apply_to_nodes(mat)
-                _log(
-                    f"[SMP] Reapplied emissive after rebuild: color={em_color}, strength={em_strength}"
+                _logd(
+                    "[SMP] Reapplied emissive after rebuild: color=%s, strength=%s",
+                    em_color,
+                    em_strength,
                 )
 
             return True
 
         except Exception as e:
-            import traceback
-
             _log(f"[SMP] build_for_material failed for {mat.name}: {e}")
-            traceback.print_exc()
+            if _LOG_ENABLED:
+                traceback.print_exc()
             return False
 
     def execute(self, ctx):
+        _reset_build_caches()
         mat = _get_active_material(ctx)
         if not mat:
             self.report({"ERROR"}, "No active material")
@@ -1526,6 +1414,17 @@ class SKPBR_OT_BuildAuto(bpy.types.Operator):
         return {"FINISHED"}
 
 
+def _unique_slot_materials(objs) -> List[bpy.types.Material]:
+    """Materials in slot order across objs, each once (NIF sub-parts often share one)."""
+    seen = {}
+    for obj in objs:
+        for slot in obj.material_slots:
+            mat = slot.material
+            if mat is not None:
+                seen.setdefault(mat.as_pointer(), mat)
+    return list(seen.values())
+
+
 class SKPBR_OT_BuildAutoSelected(bpy.types.Operator):
     """Apply Build Skyrim PBR across all materials on selected mesh objects."""
 
@@ -1534,20 +1433,17 @@ class SKPBR_OT_BuildAutoSelected(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, ctx):
+        _reset_build_caches()
         prefs = bpy.context.preferences.addons[__name__].preferences
         objs = [o for o in ctx.selected_objects if o.type == "MESH"]
         if not objs:
             self.report({"ERROR"}, "No mesh objects selected")
             return {"CANCELLED"}
         count = 0
-        op = SKPBR_OT_BuildAuto
-        for obj in objs:
-            for slot in obj.material_slots:
-                mat = slot.material
-                if not mat:
-                    continue
-                if op.build_for_material(self, mat, prefs):
-                    count += 1
+        build = SKPBR_OT_BuildAuto.build_for_material
+        for mat in _unique_slot_materials(objs):
+            if build(self, mat, prefs):
+                count += 1
         self.report({"INFO"}, f"Built {count} material(s).")
         return {"FINISHED"}
 
@@ -1560,14 +1456,15 @@ class SKPBR_OT_LoadJSONAndBuild(bpy.types.Operator, ImportHelper):
     filter_glob: StringProperty(default="*.json", options={"HIDDEN"})
 
     def execute(self, ctx):
+        _reset_build_caches()
         mat = _get_active_material(ctx)
         if not mat:
             self.report({"ERROR"}, "No active material")
             return {"CANCELLED"}
         prefs = bpy.context.preferences.addons[__name__].preferences
         try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                js = json.load(f)
+            with open(self.filepath, "rb") as f:
+                js = _json_loads(f.read())
         except Exception as e:
             self.report({"ERROR"}, f"JSON load failed: {e}")
             return {"CANCELLED"}
@@ -1593,7 +1490,6 @@ class SKPBR_OT_LoadJSONAndBuild(bpy.types.Operator, ImportHelper):
         if has_pbr or force_pbr:
             build_nodes_unified(mat, textures)
             _alpha_preview_refresh(mat)
-            _alpha_preview_refresh(mat)
             _emissive_apply_to_nodes(mat)
             _set_build_status(
                 mat, "FORCED_PBR" if (not has_pbr and force_pbr) else "PBR"
@@ -1602,7 +1498,6 @@ class SKPBR_OT_LoadJSONAndBuild(bpy.types.Operator, ImportHelper):
         else:
             build_nodes_unified(mat, textures)
             _alpha_preview_refresh(mat)
-            _alpha_preview_refresh(mat)
             _emissive_apply_to_nodes(mat)
             _set_build_status(mat, "NONPBR")
 
@@ -1611,12 +1506,25 @@ class SKPBR_OT_LoadJSONAndBuild(bpy.types.Operator, ImportHelper):
         return {"FINISHED"}
 
 
+# Texture tail -> slot for rebuilding from the images already in a tree
+_SUFFIX_MAP = {
+    "_n.dds": "NORMAL",
+    "_rmaos.dds": "RMAOS",
+    "_orm.dds": "RMAOS",
+    "_p.dds": "PARALLAX",
+    "_em.dds": "EMISSIVE",
+    "_g.dds": "EMISSIVE",
+    "_e.dds": "EMISSIVE",
+}
+
+
 class SKPBR_OT_RebuildFromNIF(bpy.types.Operator):
     bl_idname = "skpbr.rebuild_from_nif"
     bl_label = "Rebuild from NIF Textures"
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, ctx):
+        _reset_build_caches()
         mat = _get_active_material(ctx)
         if not mat or not mat.node_tree:
             self.report({"ERROR"}, "No active material")
@@ -1629,26 +1537,18 @@ class SKPBR_OT_RebuildFromNIF(bpy.types.Operator):
             "EMISSIVE": None,
         }
         for n in mat.node_tree.nodes:
-            if isinstance(n, bpy.types.ShaderNodeTexImage) and n.image:
-                try:
-                    p = Path(bpy.path.abspath(n.image.filepath))
-                    low = p.as_posix().lower()
-                except Exception:
-                    continue
-                if "_n.dds" in low:
-                    textures["NORMAL"] = p
-                elif "_rmaos.dds" in low or "_orm.dds" in low:
-                    textures["RMAOS"] = p
-                elif "_p.dds" in low:
-                    textures["PARALLAX"] = p
-                elif (
-                    low.endswith("_em.dds")
-                    or low.endswith("_g.dds")
-                    or low.endswith("_e.dds")
-                ):
-                    textures["EMISSIVE"] = p
-                elif low.endswith(".dds"):
-                    textures["BASE"] = p
+            if n.type != "TEX_IMAGE" or not n.image:
+                continue
+            fp = n.image.filepath
+            low = fp.lower()
+            if not low.endswith(".dds"):
+                continue
+            # One dict lookup on the "_xx.dds" tail; anything unrecognised is the base
+            key = _SUFFIX_MAP.get(low[low.rfind("_") :], "BASE")
+            try:
+                textures[key] = Path(bpy.path.abspath(fp))
+            except Exception:
+                continue
 
         has_pbr = _detect_pbr(textures)
         force_pbr = bool(getattr(mat, "skpbr", None) and mat.skpbr.force_build)
@@ -1656,7 +1556,6 @@ class SKPBR_OT_RebuildFromNIF(bpy.types.Operator):
         if has_pbr or force_pbr:
             build_nodes_unified(mat, textures)
             _alpha_preview_refresh(mat)
-            _alpha_preview_refresh(mat)
             _emissive_apply_to_nodes(mat)
             _set_build_status(
                 mat, "FORCED_PBR" if (not has_pbr and force_pbr) else "PBR"
@@ -1665,7 +1564,6 @@ class SKPBR_OT_RebuildFromNIF(bpy.types.Operator):
         else:
             build_nodes_unified(mat, textures)
             _alpha_preview_refresh(mat)
-            _alpha_preview_refresh(mat)
             _emissive_apply_to_nodes(mat)
             _set_build_status(mat, "NONPBR")
 
@@ -1727,6 +1625,7 @@ class SKPBR_OT_ReturnToVanilla(bpy.types.Operator):
     bl_options = {"REGISTER", "UNDO"}
 
     def execute(self, ctx):
+        _reset_build_caches()
         prefs = bpy.context.preferences.addons[__name__].preferences
         objs = [o for o in ctx.selected_objects if o.type == "MESH"]
         if not objs:
@@ -1738,16 +1637,12 @@ class SKPBR_OT_ReturnToVanilla(bpy.types.Operator):
             objs = [ctx.active_object]
 
         count = 0
-        for obj in objs:
-            for slot in obj.material_slots:
-                mat = slot.material
-                if not mat:
-                    continue
-                prefs.search_mode = "NIFPATH"
-                _clear_non_vfs_anchors(mat)
-                ok = SKPBR_OT_BuildAuto.build_for_material(self, mat, prefs)
-                if ok:
-                    count += 1
+        prefs.search_mode = "NIFPATH"
+        for mat in _unique_slot_materials(objs):
+            _clear_non_vfs_anchors(mat)
+            ok = SKPBR_OT_BuildAuto.build_for_material(self, mat, prefs)
+            if ok:
+                count += 1
 
         self.report({"INFO"}, f"Reset {count} material(s) to VFS default.")
         return {"FINISHED"}
@@ -1756,6 +1651,63 @@ class SKPBR_OT_ReturnToVanilla(bpy.types.Operator):
 # ---------------------------------------------------------------------------
 # Export Selected PBR Patch (textures + PBRNifPatcher JSON)
 # ---------------------------------------------------------------------------
+_COPY_WORKERS = min(8, os.cpu_count() or 4)
+# Map tails dropped from the base stem to get PBRNifPatcher's match_diffuse
+_EXPORT_STRIP_TAILS = frozenset(("d", "n", "rmaos", "p", "em", "e", "g", "orm"))
+
+# (operator toggle, tag, source node label) for each exportable map
+_EXPORT_MAP = (
+    ("export_diffuse", "d", LBL_BASE),
+    ("export_normal", "n", LBL_NORMAL),
+    ("export_rmaos", "rmaos", LBL_RMAOS),
+    ("export_parallax", "p", LBL_PARALLAX),
+    ("export_emissive", "g", LBL_EMISSIVE),
+)
+
+# mat.skpbr values the patch JSON needs, read in one pass per material
+_SKPBRSnap = namedtuple("_SKPBRSnap", "emiss_strength emiss_color rough disp par_def")
+_SKPBR_SNAP_DEFAULT = _SKPBRSnap(0.0, (1.0, 1.0, 1.0), 1.0, 0.05, 0.02)
+
+
+def _snapshot_skpbr(mat) -> _SKPBRSnap:
+    s = getattr(mat, "skpbr", None)
+    if s is None:
+        return _SKPBR_SNAP_DEFAULT
+    try:
+        ec = s.emissive_color
+        color = (float(ec[0]), float(ec[1]), float(ec[2]))
+    except Exception:
+        color = (1.0, 1.0, 1.0)
+    return _SKPBRSnap(
+        float(s.emissive_strength),
+        color,
+        float(s.rough_mult),
+        float(s.disp_scale),
+        float(s.parallax_default_strength),
+    )
+
+
+def _copy_if_changed(src, dst) -> bool:
+    """shutil.copy2 unless dst already matches src in size and mtime (copy2 keeps mtime)."""
+    try:
+        ss, ds = os.stat(src), os.stat(dst)
+        if ss.st_size == ds.st_size and int(ss.st_mtime) == int(ds.st_mtime):
+            return False
+    except FileNotFoundError:
+        pass
+    shutil.copy2(src, dst)
+    return True
+
+
+def _copy_texture(pair):
+    """_copy_if_changed for a worker thread; returns the exception instead of raising."""
+    try:
+        _copy_if_changed(*pair)
+    except Exception as e:
+        return e
+    return None
+
+
 class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
     """Export selected meshes' material textures + PBRNifPatcher JSON into a mod folder."""
 
@@ -1790,6 +1742,7 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
         )
 
     def execute(self, context):
+        _reset_build_caches()
         dest_root = Path(self.filepath) if self.filepath else None
         if not dest_root:
             self.report({"ERROR"}, "No destination selected")
@@ -1810,6 +1763,15 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
             self.report({"ERROR"}, "Select at least one mesh object to export")
             return {"CANCELLED"}
 
+        # Shared textures are copied once; one JSON per basename (last material wins)
+        copied = set()
+        created_dirs = {textures_root, patcher_root}
+        abs_paths: Dict[int, Path] = {}  # image.as_pointer() -> absolute Path
+        pairs: List[Tuple[Path, Path]] = []
+        patches: Dict[str, dict] = {}
+        export_maps = [
+            (tag, lbl) for attr, tag, lbl in _EXPORT_MAP if getattr(self, attr)
+        ]
         for obj in objs:
             for slot in obj.material_slots:
                 mat = slot.material
@@ -1819,80 +1781,62 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
                 # Collect texture paths by node label
                 src = {}
                 for n in mat.node_tree.nodes:
-                    if isinstance(n, bpy.types.ShaderNodeTexImage) and n.image:
-                        label = getattr(n, "label", "")
+                    if n.type != "TEX_IMAGE" or not n.image:
+                        continue
+                    ip = n.image.as_pointer()
+                    path = abs_paths.get(ip)
+                    if path is None:
                         try:
                             path = Path(bpy.path.abspath(n.image.filepath))
                         except Exception:
                             continue
-                        src[label] = path
+                        abs_paths[ip] = path
+                    src[n.label] = path
 
                 base_path = src.get(LBL_BASE)
                 if not base_path:
                     continue
 
                 # Derive Skyrim-like relative path under textures/
-                parts_low = [p.lower() for p in base_path.parts]
-                if "textures" in parts_low:
-                    idx = parts_low.index("textures")
-                    skyrim_rel = Path(*base_path.parts[idx + 1 :])
+                posix = base_path.as_posix()
+                i = ("/" + posix.lower()).find("/textures/")
+                if i >= 0:
+                    skyrim_rel = Path(posix[i + len("textures/") :])
                 else:
                     skyrim_rel = Path(base_path.name)
 
                 out_dir = textures_root / skyrim_rel.parent
-                out_dir.mkdir(parents=True, exist_ok=True)
+                if out_dir not in created_dirs:
+                    out_dir.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(out_dir)
 
                 # Decide which maps to copy
-                to_copy: List[Tuple[str, Optional[Path]]] = []
-                if self.export_diffuse:
-                    to_copy.append(("d", src.get(LBL_BASE)))
-                if self.export_normal:
-                    to_copy.append(("n", src.get(LBL_NORMAL)))
-                if self.export_rmaos:
-                    to_copy.append(("rmaos", src.get(LBL_RMAOS)))
-                if self.export_parallax:
-                    to_copy.append(("p", src.get(LBL_PARALLAX)))
-                if self.export_emissive:
-                    to_copy.append(("g", src.get(LBL_EMISSIVE)))
+                to_copy = [(tag, src.get(lbl)) for tag, lbl in export_maps]
 
                 # Copy
                 for tag, p in to_copy:
-                    if not p or not p.is_file():
+                    if not p or not _is_file_cached(str(p)):
                         continue
                     dst = out_dir / p.name
-                    try:
-                        if os.path.abspath(p) != os.path.abspath(dst):
-                            shutil.copy2(p, dst)
+                    key = (os.path.normpath(os.fspath(p)), os.path.normpath(dst))
+                    if key in copied:
+                        continue
+                    copied.add(key)
+                    if key[0] == key[1]:
                         exported_any = True
-                    except Exception as e:
-                        _log(f"Copy failed: {p} -> {dst}: {e}")
+                    else:
+                        pairs.append((p, dst))
 
                 # Write PBRNifPatcher JSON for this material
                 basename = base_path.stem
-                for suf in ("_d", "_n", "_rmaos", "_p", "_em", "_e", "_g", "_orm"):
-                    if basename.lower().endswith(suf):
-                        basename = basename[: -len(suf)]
-                        break
+                head, sep, tail = basename.rpartition("_")
+                if sep and tail.lower() in _EXPORT_STRIP_TAILS:
+                    basename = head
 
                 # Emissive export rules:
-                emissive_strength_val = (
-                    float(getattr(mat.skpbr, "emissive_strength", 0.0))
-                    if hasattr(mat, "skpbr")
-                    else 0.0
-                )
-                try:
-                    ec_src = (
-                        list(getattr(mat.skpbr, "emissive_color", (1, 1, 1, 1)))
-                        if hasattr(mat, "skpbr")
-                        else [1, 1, 1, 1]
-                    )
-                    emission_color = [
-                        float(ec_src[0]),
-                        float(ec_src[1]),
-                        float(ec_src[2]),
-                    ]
-                except Exception:
-                    emission_color = [1.0, 1.0, 1.0]
+                snap = _snapshot_skpbr(mat)
+                emissive_strength_val = snap.emiss_strength
+                emission_color = list(snap.emiss_color)
                 emissive_flag = (
                     bool(src.get(LBL_EMISSIVE)) and self.export_emissive
                 ) or (emissive_strength_val > 0.0)
@@ -1923,11 +1867,7 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
                 elif disp_scale_val is not None:
                     parallax_strength_json = disp_scale_val / 10.0
                 else:
-                    parallax_strength_json = (
-                        float(getattr(mat.skpbr, "parallax_default_strength", 0.02))
-                        if hasattr(mat, "skpbr")
-                        else 0.02
-                    )
+                    parallax_strength_json = snap.par_def
 
                 patch = {
                     "match_diffuse": basename,
@@ -1935,26 +1875,29 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
                     "parallax_strength": round(float(parallax_strength_json), 5),
                     "emissive": bool(emissive_flag),
                     "specular_level": 0.04,
-                    "roughness_scale": (
-                        float(getattr(mat.skpbr, "rough_mult", 1.0))
-                        if hasattr(mat, "skpbr")
-                        else 1.0
-                    ),
-                    "displacement_scale": (
-                        float(getattr(mat.skpbr, "disp_scale", 0.05))
-                        if hasattr(mat, "skpbr")
-                        else 0.05
-                    ),
+                    "roughness_scale": snap.rough,
+                    "displacement_scale": snap.disp,
                     "emission_strength": float(emissive_strength_val),
                     "emission_color": emission_color,
                 }
-                patch_path = patcher_root / f"{basename}.json"
-                try:
-                    with open(patch_path, "w", encoding="utf-8") as f:
-                        json.dump(patch, f, indent=2)
-                    exported_any = True
-                except Exception as e:
-                    _log(f"Failed to write patch JSON {patch_path}: {e}")
+                patches[basename] = patch
+
+        # Copies touch no bpy state, so they run on worker threads; JSON stays here
+        if pairs:
+            with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as ex:
+                for (p, dst), err in zip(pairs, ex.map(_copy_texture, pairs)):
+                    if err is None:
+                        exported_any = True
+                    else:
+                        _log(f"Copy failed: {p} -> {dst}: {err}")
+
+        for basename, patch in patches.items():
+            patch_path = patcher_root / f"{basename}.json"
+            try:
+                patch_path.write_bytes(_json_dumps_indent(patch))
+                exported_any = True
+            except Exception as e:
+                _log(f"Failed to write patch JSON {patch_path}: {e}")
 
         if exported_any:
             self.report({"INFO"}, f"Export complete: {dest_root}")
@@ -1969,17 +1912,40 @@ class SKPBR_OT_ExportPatch(bpy.types.Operator, ImportHelper):
 # ---------------------------------------------------------------------------
 # UI Panel
 # ---------------------------------------------------------------------------
+# (mat pointer, mode, force_build, build status) -> (lines, time.monotonic() stamp)
+_PEEK_CACHE: Dict[tuple, Tuple[List[str], float]] = {}
+_PEEK_TTL = 1.0  # seconds; anchors picked by hand show up within this
+
+
 def _peek_status(context) -> List[str]:
     mat = _get_active_material(context)
     if not mat:
         return ["No material selected"]
     try:
-        prefs = bpy.context.preferences.addons[__name__].preferences
+        prefs = context.preferences.addons[__name__].preferences
     except Exception:
         return ["Addon prefs not ready"]
-    anchor = _choose_anchor_for_mode(mat, prefs)
+    return _peek_status_for(mat, prefs, _get_build_status(mat))
+
+
+def _peek_status_for(mat, prefs, status) -> List[str]:
+    """_peek_status for callers that already hold the material, prefs and build status."""
     mode = prefs.search_mode
-    status = _get_build_status(mat)
+    sk = getattr(mat, "skpbr", None)
+    key = (mat.as_pointer(), mode, bool(sk and sk.force_build), status)
+    now = time.monotonic()
+    cached = _PEEK_CACHE.get(key)
+    if cached is not None and now - cached[1] < _PEEK_TTL:
+        return cached[0]
+    # The fs caches only reset per build; re-stat so files added since show up
+    _fs_cache_clear()
+    lines = _peek_status_lines(mat, prefs, mode, status)
+    _PEEK_CACHE[key] = (lines, now)
+    return lines
+
+
+def _peek_status_lines(mat, prefs, mode, status) -> List[str]:
+    anchor = _choose_anchor_for_mode(mat, prefs)
     lines = []
     if anchor:
         lines.append(f"{mode} anchor: {str(anchor)}")
@@ -2050,6 +2016,11 @@ class SKPBR_OT_PatchEmissiveBatch(bpy.types.Operator):
     emissive_color: bpy.props.FloatVectorProperty(
         name="Emissive Color (RGB)", subtype="COLOR", size=3, default=(1.0, 0.9, 0.75)
     )
+    skip_current: bpy.props.BoolProperty(
+        name="Skip Up-to-date",
+        description="Skip NIFs whose patched copy in the Output Folder is newer than the source",
+        default=False,
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -2057,13 +2028,13 @@ class SKPBR_OT_PatchEmissiveBatch(bpy.types.Operator):
         layout.prop(self, "output_dir")
         layout.prop(self, "emissive_multiple")
         layout.prop(self, "emissive_color")
+        layout.prop(self, "skip_current")
 
     def invoke(self, context, event):
         # small dialog with the fields above
         return context.window_manager.invoke_props_dialog(self, width=520)
 
     def execute(self, context):
-        import os, bpy
         from . import patch_emissive
 
         input_folder = bpy.path.abspath(self.input_dir)
@@ -2082,24 +2053,37 @@ class SKPBR_OT_PatchEmissiveBatch(bpy.types.Operator):
                 self.report({"ERROR"}, f"Could not create Output Folder: {e}")
                 return {"CANCELLED"}
 
-        # pass settings to the standalone script
-        patch_emissive.INPUT_DIR = input_folder
-        patch_emissive.OUTPUT_DIR = output_folder
-        patch_emissive.EMISSIVE_MULTIPLE = float(self.emissive_multiple)
-        patch_emissive.EMISSIVE_COLOR = tuple(self.emissive_color)
+        jobs = list(
+            patch_emissive.iter_jobs(
+                input_folder,
+                output_folder,
+                float(self.emissive_multiple),
+                tuple(self.emissive_color),
+                skip_current=self.skip_current,
+            )
+        )
+        # Blender < 2.91 keeps the bundled interpreter apart from sys.executable
+        python = getattr(bpy.app, "binary_path_python", None) or sys.executable
 
+        wm = context.window_manager
+        wm.progress_begin(0, max(len(jobs), 1))
         try:
-            patch_emissive.main()
+            changed = patch_emissive.process_files(
+                jobs,
+                executable=python,
+                progress=lambda done, _total: wm.progress_update(done),
+            )
             self.report(
-                {"INFO"}, f"Patched NIFs from '{input_folder}' → '{output_folder}'"
+                {"INFO"},
+                f"Patched {changed}/{len(jobs)} NIFs from '{input_folder}' → '{output_folder}'",
             )
             return {"FINISHED"}
         except Exception as e:
-            import traceback
-
             traceback.print_exc()
             self.report({"ERROR"}, f"Patch emissive failed: {e}")
             return {"CANCELLED"}
+        finally:
+            wm.progress_end()
 
 
 class SKPBR_PT_UI(bpy.types.Panel):
@@ -2112,9 +2096,15 @@ class SKPBR_PT_UI(bpy.types.Panel):
     def draw(self, context):
         lay = self.layout
         col = lay.column(align=True)
+        # Looked up once per redraw and shared by every block below
+        prefs = context.preferences.addons[__name__].preferences
+        mat = _get_active_material(context)
+        sk = getattr(mat, "skpbr", None) if mat else None
+        status = _get_build_status(mat) if mat else ""
 
         # Status
-        for l in _peek_status(context):
+        lines = _peek_status_for(mat, prefs, status) if mat else ["No material selected"]
+        for l in lines:
             col.label(text=l)
         col.separator()
 
@@ -2131,7 +2121,6 @@ class SKPBR_PT_UI(bpy.types.Panel):
         col.separator()
 
         # Search mode
-        prefs = bpy.context.preferences.addons[__name__].preferences
         col.label(text="Texture Search Mode:")
         col.prop(prefs, "search_mode", expand=True)
         if prefs.search_mode == "MANUAL":
@@ -2141,42 +2130,40 @@ class SKPBR_PT_UI(bpy.types.Panel):
         col.separator()
 
         # Live settings – visible only when we are in PBR or Forced PBR
-        mat = _get_active_material(context)
-        status = _get_build_status(mat) if mat else ""
         show_pbr_controls = status in ("PBR", "FORCED_PBR")
 
-        if mat and hasattr(mat, "skpbr") and show_pbr_controls:
+        if sk is not None and show_pbr_controls:
             col.label(text="Adjustments (live):")
-            col.prop(mat.skpbr, "rough_mult")
-            col.prop(mat.skpbr, "invert_roughness")
-            col.prop(mat.skpbr, "metal_mult")
-            col.prop(mat.skpbr, "normal_strength")
-            col.prop(mat.skpbr, "disp_scale")
-            col.prop(mat.skpbr, "disp_mid")
-            col.prop(mat.skpbr, "use_parallax_m")
+            col.prop(sk, "rough_mult")
+            col.prop(sk, "invert_roughness")
+            col.prop(sk, "metal_mult")
+            col.prop(sk, "normal_strength")
+            col.prop(sk, "disp_scale")
+            col.prop(sk, "disp_mid")
+            col.prop(sk, "use_parallax_m")
             # (legacy emissive_* UI removed: using unified emission_* controls below)
 
-            col.prop(mat.skpbr, "ao_strength")
-            col.prop(mat.skpbr, "flip_norm_y")
+            col.prop(sk, "ao_strength")
+            col.prop(sk, "flip_norm_y")
             col.label(text="ON = Blender preview; OFF = Skyrim export.", icon="INFO")
 
         # Force PBR toggle always visible (so you can force next build)
-        if mat and hasattr(mat, "skpbr"):
+        if sk is not None:
             col.separator()
             row = col.row(align=True)
-            row.prop(mat.skpbr, "force_build")
+            row.prop(sk, "force_build")
             col.separator()
             col.label(text="Emission", icon="LIGHT_HEMI")
             row = col.row(align=True)
-            row.prop(mat.skpbr, "emission_on", text="On")
-            row.prop(mat.skpbr, "emission_strength", text="Strength")
-            col.prop(mat.skpbr, "emission_color", text="Color")
-            col.prop(mat.skpbr, "alpha_strength")
-            col.prop(mat.skpbr, "use_parallax_m")
-            col.prop(mat.skpbr, "parallax_default_strength")
+            row.prop(sk, "emission_on", text="On")
+            row.prop(sk, "emission_strength", text="Strength")
+            col.prop(sk, "emission_color", text="Color")
+            col.prop(sk, "alpha_strength")
+            col.prop(sk, "use_parallax_m")
+            col.prop(sk, "parallax_default_strength")
             hint = (
                 "(Will build full PBR even if set is incomplete)"
-                if mat.skpbr.force_build
+                if sk.force_build
                 else "(If VFS is non-PBR, build vanilla nodes)"
             )
             row = col.row(align=True)
@@ -2204,76 +2191,6 @@ classes = (
 )
 
 
-# --- Emissive extraction for SE/AE (best-effort) ---
-def _extract_emissive_from_nif(obj, nif_path=None):
-    """
-    Best-effort reader for Skyrim SE/AE emissive values.
-    Tries PyNifly if available; otherwise returns (None, None).
-    Returns: (color_tuple_rgb, multiple_float) or (None, None)
-    """
-    try:
-        try:
-            import pynifly  # confirmed available in your setup
-        except Exception:
-            pynifly = None
-
-        # Resolve nif path if not provided
-        if not nif_path:
-            # Try common places your addon stores anchors/paths
-            nif_path = getattr(obj, "nif_path", None)
-            if not nif_path:
-                try:
-                    for k in getattr(obj, "keys", lambda: [])():
-                        if "nif" in k.lower() and str(obj[k]).lower().endswith(".nif"):
-                            nif_path = obj[k]
-                            break
-                except Exception:
-                    pass
-
-        if not nif_path or not isinstance(nif_path, str):
-            return (None, None)
-
-        # Try PyNifly structured read (may not expose emissive; harmless if missing)
-        if pynifly is not None:
-            try:
-                nif = pynifly.load_nif(nif_path)
-                for b in getattr(nif, "blocks", []):
-                    col = None
-                    mul = None
-                    if hasattr(b, "emissive_color"):
-                        try:
-                            rgb = tuple(getattr(b, "emissive_color"))
-                            if len(rgb) >= 3:
-                                col = (float(rgb[0]), float(rgb[1]), float(rgb[2]))
-                        except Exception:
-                            pass
-                    if hasattr(b, "emissive_multiple"):
-                        try:
-                            mul = float(getattr(b, "emissive_multiple"))
-                        except Exception:
-                            pass
-                    if col is None and hasattr(b, "emissive"):
-                        try:
-                            rgb = tuple(getattr(b, "emissive"))
-                            if len(rgb) >= 3:
-                                col = (float(rgb[0]), float(rgb[1]), float(rgb[2]))
-                        except Exception:
-                            pass
-                    if mul is None and hasattr(b, "emissive_mult"):
-                        try:
-                            mul = float(getattr(b, "emissive_mult"))
-                        except Exception:
-                            pass
-                    if col is not None or mul is not None:
-                        return (col, mul if mul is not None else 0.0)
-            except Exception:
-                pass
-
-        return (None, None)
-    except Exception:
-        return (None, None)
-
-
 # --------------------------------------------------------------
 # Load / Unload Embedded Blender-DDS-Addon (Third-party Integration)
 # --------------------------------------------------------------
@@ -2314,9 +2231,11 @@ def _load_embedded_dds_addon():
             print(f"[SMP] Embedded DDS Addon registered from {dds_addon.__file__}")
         else:
             print(f"[SMP WARNING] DDS Addon loaded but has no 'register' method.")
+        return dds_addon
     except Exception as e:
         print(f"[SMP ERROR] Failed to load DDS Addon: {e}")
     # =============================================
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -2336,48 +2255,98 @@ def _unload_embedded_dds_addon(dds_addon):
         print(f"[SMP ERROR] Failed to unload DDS Addon: {e}")
 
 
-def register():
+_ANCHOR_MSGBUS_OWNER = object()
 
-    # v205: purge duplicate Emission and _m panels from this module
-    try:
-        seen_em = False
-        seen_m = False
-        for name, cls in list(bpy.types.__dict__.items()):
-            if not (isinstance(cls, type) and issubclass(cls, bpy.types.Panel)):
-                continue
-            mod = getattr(cls, "__module__", "")
-            if __name__ not in mod:
-                continue
-            lab = (getattr(cls, "bl_label", "") or "").lower()
-            cname = name.lower()
-            is_em = (
-                ("emission" in lab) or ("emissive" in lab) or ("emission color" in lab)
-            )
-            is_m = (
-                ("use _m as parallax" in lab)
-                or ("parallax (pg mode)" in lab)
-                or ("_m" in lab)
-            )
-            if is_em:
+
+def _on_image_assignment_changed(*_args):
+    _ANCHOR_CACHE.clear()
+
+
+def _subscribe_anchor_invalidation():
+    """Drop cached anchor paths whenever an image node's image or an image's filepath changes."""
+    bpy.msgbus.clear_by_owner(_ANCHOR_MSGBUS_OWNER)
+    for key in (
+        (bpy.types.ShaderNodeTexImage, "image"),
+        (bpy.types.Image, "filepath"),
+    ):
+        bpy.msgbus.subscribe_rna(
+            key=key,
+            owner=_ANCHOR_MSGBUS_OWNER,
+            args=(),
+            notify=_on_image_assignment_changed,
+        )
+
+
+@persistent
+def _smp_on_load_post(*_args):
+    # msgbus subscriptions don't survive loading a .blend, and cached state is per-file
+    global _SMP_DRAW_DIRTY
+    _SMP_DRAW_DIRTY = True
+    _ANCHOR_CACHE.clear()
+    clear_build_cache()
+    _IMAGE_CACHE.clear()
+    _NIF_EMISSIVE.clear()
+    _EM_APPLIED.clear()
+    _EMIS_FP.clear()
+    _ALPHA_FP.clear()
+    _read_nif_bytes.cache_clear()
+    _parse_nif_alpha_cached.cache_clear()
+    _subscribe_anchor_invalidation()
+
+
+# One shared poll for every hidden legacy panel
+def _smp_poll_false(_cls, _ctx):
+    return False
+
+
+_SMP_POLL_FALSE = classmethod(_smp_poll_false)
+
+
+def _hide_panel(cls):
+    cls.poll = _SMP_POLL_FALSE
+
+
+def _drop_panel(cls, removed):
+    """Unregister a stale panel; if Blender refuses, hide it instead."""
+    try:
+        bpy.utils.unregister_class(cls)
+        removed.add(cls)
+    except Exception:
+        try:
+            _hide_panel(cls)
+        except Exception:
+            pass
+
+
+def _purge_legacy_panels():
+    """Drop/hide Emission and _m panels left behind by earlier loads of this module."""
+    # One walk over bpy.types; the three policies below share the lowered labels
+    mod_name = __name__
+    panel = bpy.types.Panel
+    panels = []  # (cls, label_lower, class_name_lower) in bpy.types order
+    for name, cls in list(bpy.types.__dict__.items()):
+        if not (isinstance(cls, type) and issubclass(cls, panel)):
+            continue
+        if mod_name not in getattr(cls, "__module__", ""):
+            continue
+        panels.append((cls, (getattr(cls, "bl_label", "") or "").lower(), name.lower()))
+    removed = set()
+
+    # v205: purge duplicate Emission and _m panels from this module
+    try:
+        seen_em = False
+        seen_m = False
+        for cls, lab, _cname in panels:
+            is_em = "emission" in lab or "emissive" in lab
+            is_m = "parallax (pg mode)" in lab or "_m" in lab
+            if is_em:
                 if seen_em:
-                    try:
-                        bpy.utils.unregister_class(cls)
-                    except Exception:
-                        try:
-                            cls.poll = classmethod(lambda _c, _ctx: False)
-                        except Exception:
-                            pass
+                    _drop_panel(cls, removed)
                 else:
                     seen_em = True
             if is_m:
                 if seen_m:
-                    try:
-                        bpy.utils.unregister_class(cls)
-                    except Exception:
-                        try:
-                            cls.poll = classmethod(lambda _c, _ctx: False)
-                        except Exception:
-                            pass
+                    _drop_panel(cls, removed)
                 else:
                     seen_m = True
         print(f"[SMP v205] UI purge done. kept_em={seen_em} kept_m={seen_m}")
@@ -2385,33 +2354,22 @@ def register():
         print("[SMP v205] UI purge failed:", e)
     # SMP v202: Purge legacy Emissive/_m panels from any previous loads
     try:
-        to_hide = []
-        for _n, _cls in list(bpy.types.__dict__.items()):
-            if isinstance(_cls, type) and issubclass(_cls, bpy.types.Panel):
-                mod = getattr(_cls, "__module__", "")
-                lab = (getattr(_cls, "bl_label", "") or "").lower()
-                cname = _n.lower()
-                if (
-                    "emiss" in lab
-                    or "emiss" in cname
-                    or "use _m as parallax" in lab
-                    or "pg mode" in lab
-                ) and __name__ in mod:
-                    to_hide.append(_cls)
         # Keep a single _m panel by leaving the first one intact if multiple
         kept_m = False
-        for _cls in to_hide:
-            is_m = "use _m as parallax" in (getattr(_cls, "bl_label", "") or "").lower()
-            if is_m and not kept_m:
+        for cls, lab, cname in panels:
+            if cls in removed:
+                continue
+            if not (
+                "emiss" in lab
+                or "emiss" in cname
+                or "use _m as parallax" in lab
+                or "pg mode" in lab
+            ):
+                continue
+            if "use _m as parallax" in lab and not kept_m:
                 kept_m = True
                 continue
-            try:
-                bpy.utils.unregister_class(_cls)
-            except Exception:
-                try:
-                    _cls.poll = classmethod(lambda _c, _ctx: False)
-                except Exception:
-                    pass
+            _drop_panel(cls, removed)
         print(
             "[SMP] Legacy UI purged; kept single _m toggle."
             if kept_m
@@ -2420,27 +2378,31 @@ def register():
     except Exception as _e:
         print("[SMP] Legacy UI purge failed:", _e)
     try:
-        for _n, _cls in list(bpy.types.__dict__.items()):
-            if isinstance(_cls, type) and issubclass(_cls, bpy.types.Panel):
-                mod = getattr(_cls, "__module__", "")
-                lab = (getattr(_cls, "bl_label", "") or "").lower()
-                cname = _n.lower()
-                if __name__ in mod and (
-                    "parallaxgen" in lab
-                    or "use _m" in lab
-                    or "pg mode" in lab
-                    or ("emission color" in lab)
-                    or ("use _m as parallax" in lab)
-                    or ("emiss" in lab and "adjustments" not in lab)
-                ):
-                    _cls.poll = classmethod(lambda _c, _ctx: False)
+        for cls, lab, _cname in panels:
+            if cls in removed:
+                continue
+            if (
+                "parallaxgen" in lab
+                or "use _m" in lab
+                or "pg mode" in lab
+                or "emission color" in lab
+                or ("emiss" in lab and "adjustments" not in lab)
+            ):
+                _hide_panel(cls)
         print("[BabyJaws SMP] Legacy emissive panels hidden.")
     except Exception as _e:
         print("[BabyJaws SMP] Hide legacy panels failed:", _e)
-    for c in classes:
-        bpy.utils.register_class(c)
-    bpy.types.Material.skpbr = PointerProperty(type=SKPBR_PG_Settings)
-    _log("Addon registered (v1.9.8, strict stem matching + Return to Vanilla).")
+
+
+_embedded_dds_addon = None
+# True while _deferred_register is queued, so a quick re-enable doesn't queue it twice
+_deferred_pending = False
+
+
+def _deferred_register():
+    """Timer half of register(): integrate bundled PBRGen and the embedded DDS addon."""
+    global _deferred_pending, _embedded_dds_addon
+    _deferred_pending = False
 
     # ------------------------------------------------------------------------
     # Integrate PBRGen (bundled) if present
@@ -2454,11 +2416,43 @@ def register():
     except Exception as e:
         print(f"[SMP] Warning: could not load PBRGen: {e}")
 
-    global _embedded_dds_addon
-    _embedded_dds_addon = _load_embedded_dds_addon()
+    if _embedded_dds_addon is None:
+        _embedded_dds_addon = _load_embedded_dds_addon()
+    return None
+
+
+def register():
+    _purge_legacy_panels()
+    for c in classes:
+        bpy.utils.register_class(c)
+    bpy.types.Material.skpbr = PointerProperty(type=SKPBR_PG_Settings)
+    _log("Addon registered (v1.9.8, strict stem matching + Return to Vanilla).")
+
+    # Bundled PBRGen + DDS addon import many modules; load them after enable returns
+    global _deferred_pending
+    if bpy.app.background:
+        _deferred_register()
+    elif not _deferred_pending:
+        _deferred_pending = True
+        bpy.app.timers.register(_deferred_register, first_interval=0.01)
+
+    _subscribe_anchor_invalidation()
+    if _smp_on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_smp_on_load_post)
+    if _smp_on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_smp_on_depsgraph_update)
+    for hl in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _smp_on_undo_redo not in hl:
+            hl.append(_smp_on_undo_redo)
 
 
 def unregister():
+    global _deferred_pending
+    if bpy.app.timers.is_registered(_deferred_register):
+        # Disabled before the deferred half ran; nothing of it to undo
+        bpy.app.timers.unregister(_deferred_register)
+    _deferred_pending = False
+
     # ------------------------------------------------------------------------
     # Cleanly remove PBRGen if it was registered
     # ------------------------------------------------------------------------
@@ -2471,6 +2465,26 @@ def unregister():
     except Exception:
         pass
 
+    if bpy.app.timers.is_registered(_flush_pending):
+        bpy.app.timers.unregister(_flush_pending)
+    if bpy.app.timers.is_registered(_flush_node_maps):
+        bpy.app.timers.unregister(_flush_node_maps)
+    _NODE_MAP_PENDING.clear()
+    if bpy.app.timers.is_registered(_flush_emission):
+        bpy.app.timers.unregister(_flush_emission)
+    _EM_DIRTY.clear()
+    _PENDING.clear()
+
+    if _smp_on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_smp_on_load_post)
+    if _smp_on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_smp_on_depsgraph_update)
+    for hl in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if _smp_on_undo_redo in hl:
+            hl.remove(_smp_on_undo_redo)
+    bpy.msgbus.clear_by_owner(_ANCHOR_MSGBUS_OWNER)
+    _ANCHOR_CACHE.clear()
+
     # ------------------------------------------------------------------------
     # Original SMP unregistration logic (unchanged)
     # ------------------------------------------------------------------------
@@ -2488,202 +2502,139 @@ if __name__ == "__main__":
     register()
 
 
-# ---------------------------------------------------------------
-# NIF Emissive Extraction Helper (PyNifly-compatible)
-# ---------------------------------------------------------------
-def extract_emissive_from_pynifly(obj):
-    """
-    Try to extract emissive color and multiple from a PyNifly-imported object.
-
-    This checks PyNifly's internal nif_blocks data for emissiveColor and
-    emissiveMultiple fields, returning a dict {"color": (r,g,b), "strength": float}.
-    Safe to call even if the fields aren't available.
-    """
-    try:
-        data = getattr(obj.data, "nif_blocks", None)
-        if not data:
-            return None
-
-        for blk in data:
-            if hasattr(blk, "emissiveColor") and hasattr(blk, "emissiveMultiple"):
-                color = tuple(getattr(blk, "emissiveColor"))
-                strength = float(getattr(blk, "emissiveMultiple"))
-                # Clamp & normalize
-                color = tuple(max(0.0, min(1.0, c)) for c in color)
-                strength = max(0.0, min(strength, 10.0))
-                return {"color": color, "strength": strength}
-        return None
-    except Exception as e:
-        print(f"[SKPBR] emissive extraction failed: {e}")
-        return None
-
-
-# ---------------------------------------------------------------
-# Apply emissive color and strength to material nodes
-# ---------------------------------------------------------------
-def _emissive_apply_to_nodes(mat):
-    """Update any emission nodes in PBR or Vanilla setups with current skpbr data."""
-    try:
-        s = getattr(mat, "skpbr", None)
-        if not s or not s.emission_on:
-            return
-        nt = getattr(mat, "node_tree", None)
-        if not nt:
-            return
-
-        color = list(s.emission_color) + [1.0]
-        strength = s.emission_strength
-
-        for node in nt.nodes:
-            # Principled BSDF (PBR)
-            if node.type == "BSDF_PRINCIPLED":
-                node.inputs["Emission"].default_value = color
-                # Not all Blender versions have a separate "Emission Strength" input
-                if "Emission Strength" in node.inputs:
-                    node.inputs["Emission Strength"].default_value = strength
-                else:
-                    # Approximate by brightening emission color
-                    node.inputs["Emission"].default_value = [
-                        c * strength for c in color
-                    ]
-                print(f"[SMP] Applied emissive to PBR node for {mat.name}")
-                return
-
-            # Skyrim Shader Group (Vanilla)
-            if node.type == "GROUP" and "Skyrim Shader" in node.name:
-                if "Emission Color" in node.inputs:
-                    node.inputs["Emission Color"].default_value = color
-                if "Emission Strength" in node.inputs:
-                    node.inputs["Emission Strength"].default_value = strength
-                print(f"[SMP] Applied emissive to Skyrim Shader node for {mat.name}")
-                return
-
-    except Exception as e:
-        print(f"[SMP] emissive node sync failed for {mat.name}: {e}")
-
-
 def _init_emissive_from_nif(mat):
     """Sync emissive from NIF flags or numeric props; enable by flags even if no texture."""
     try:
-        if not hasattr(mat, "skpbr"):
+        sk = getattr(mat, "skpbr", None)
+        if sk is None:
             return
         got_numeric = False
-        if hasattr(mat, "keys"):
-            for key_col in (
-                "emissive_color",
-                "Emissive Color",
-                "EmitColor",
-                "emissive",
-            ):
-                if key_col in mat.keys():
-                    col = mat[key_col]
-                    if isinstance(col, (list, tuple)) and len(col) == 3:
-                        mat.skpbr.emission_color = (
-                            float(col[0]),
-                            float(col[1]),
-                            float(col[2]),
-                        )
-                        got_numeric = True
-                        break
-            for key_mul in (
-                "emissive_multiple",
-                "Emissive Multiple",
-                "EmissiveMultiple",
-                "emissiveMult",
-            ):
-                if key_mul in mat.keys():
+        # One enumeration of the ID properties; every lookup below is a set hit
+        keys = set(mat.keys()) if hasattr(mat, "keys") else frozenset()
+        for key_col in (
+            "emissive_color",
+            "Emissive Color",
+            "EmitColor",
+            "emissive",
+        ):
+            if key_col in keys:
+                col = mat[key_col]
+                if isinstance(col, (list, tuple)) and len(col) == 3:
+                    sk.emission_color = (
+                        float(col[0]),
+                        float(col[1]),
+                        float(col[2]),
+                    )
+                    got_numeric = True
+                    break
+        for key_mul in (
+            "emissive_multiple",
+            "Emissive Multiple",
+            "EmissiveMultiple",
+            "emissiveMult",
+        ):
+            if key_mul in keys:
+                try:
+                    val = float(mat[key_mul])
+                    sk.emission_strength = max(0.0, val)
+                    got_numeric = True
+                    break
+                except Exception:
+                    pass
+
+        def _read_flags(candidates):
+            for k in candidates:
+                if k in keys:
                     try:
-                        val = float(mat[key_mul])
-                        mat.skpbr.emission_strength = max(0.0, val)
-                        got_numeric = True
-                        break
+                        v = str(mat[k])
                     except Exception:
-                        pass
-
-        def _read_flags(k):
-            try:
-                if hasattr(mat, "keys") and k in mat.keys():
-                    return str(mat[k])
-            except Exception:
-                pass
+                        continue
+                    if v:
+                        return v
             return ""
 
-        raw_f1 = (
-            _read_flags("shader_flags_1")
-            or _read_flags("Shader_Flags_1")
-            or _read_flags("BSLighting_Shader_Flags_1")
-        )
-        raw_f2 = (
-            _read_flags("shader_flags_2")
-            or _read_flags("Shader_Flags_2")
-            or _read_flags("BSLighting_Shader_Flags_2")
-        )
-        s = (raw_f1 + " " + raw_f2).upper()
-
-        tokens = [
-            "OWN_EMIT",
-            "EXTERNAL_EMITTANCE",
-            "GLOW",
-            "SOFT_LIGHTING",
-            "EFFECT_LIGHTING",
-        ]
-        flags_hit = [t for t in tokens if t in s]
+        raw_f1 = _read_flags(_FLAG_KEYS_1)
+        raw_f2 = _read_flags(_FLAG_KEYS_2)
+        flags_hit = []
+        if raw_f1 or raw_f2:
+            s = (raw_f1 + " " + raw_f2).upper()
+            # Keep the historical token order for the log line
+            found = set(_EMIT_FLAG_RE.findall(s))
+            flags_hit = [t for t in _EMIT_FLAG_TOKENS if t in found]
 
         if flags_hit:
-            print(
-                f"[SkyrimPatcher] Emissive flags on {mat.name}: {', '.join(flags_hit)}"
+            _logd(
+                "[SkyrimPatcher] Emissive flags on %s: %s", mat.name, ", ".join(flags_hit)
             )
 
         # If flags suggest emissive and strength is 0, set to Skyrim default 1.0
-        if flags_hit and getattr(mat.skpbr, "emission_strength", 0.0) <= 0.0:
-            mat.skpbr.emission_strength = 1.0
+        if flags_hit and sk.emission_strength <= 0.0:
+            sk.emission_strength = 1.0
+
+        if got_numeric:
+            c = sk.emission_color
+            _NIF_EMISSIVE[mat.name] = (
+                (float(c[0]), float(c[1]), float(c[2])),
+                float(sk.emission_strength),
+            )
+        else:
+            # Props removed since the last build; don't reapply stale values
+            _NIF_EMISSIVE.pop(mat.name, None)
 
         # Final toggle mirrors strength > 0
-        mat.skpbr.emission_on = bool(getattr(mat.skpbr, "emission_strength", 0.0) > 0.0)
-
-        if mat.skpbr.emission_on:
-            print(
-                f"[SkyrimPatcher] Emission ON {mat.name} (strength={mat.skpbr.emission_strength:.3f}, color={tuple(mat.skpbr.emission_color)})"
+        sk.emission_on = bool(sk.emission_strength > 0.0)
+
+        if sk.emission_on:
+            _logd(
+                "[SkyrimPatcher] Emission ON %s (strength=%.3f, color=%s)",
+                mat.name,
+                sk.emission_strength,
+                tuple(sk.emission_color),
             )
     except Exception as e:
         print("[SkyrimPatcher] _init_emissive_from_nif error:", e)
 
 
+def _emissive_apply_to_skyrim_shader(mat, sk):
+    """Vanilla builds have no Principled; PyNifly's Skyrim Shader group takes emission."""
+    grp = next(
+        (n for n in mat.node_tree.nodes if n.type == "GROUP" and _is_skyrim_shader(n)),
+        None,
+    )
+    if grp is None:
+        return
+    strength = float(sk.emission_strength) if bool(sk.emission_on) else 0.0
+    try:
+        if "Emission Color" in grp.inputs:
+            grp.inputs["Emission Color"].default_value = (*sk.emission_color, 1.0)
+        if "Emission Strength" in grp.inputs:
+            grp.inputs["Emission Strength"].default_value = strength
+    except Exception:
+        pass
+
+
 def _emissive_apply_to_nodes(mat):
     """Apply emission_on/strength/color to our labeled nodes only (safe; won't touch AO)."""
     try:
         if not mat or not getattr(mat, "node_tree", None) or not hasattr(mat, "skpbr"):
             return
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
-
-        # Principled
-        n_bsdf = next(
-            (n for n in nodes if getattr(n, "type", "") == "BSDF_PRINCIPLED"), None
-        )
+        sk = mat.skpbr
+        nt = mat.node_tree
+        n_bsdf = _smp_find_bsdf(nt)
         if not n_bsdf:
+            _emissive_apply_to_skyrim_shader(mat, sk)
             return
 
         # Color node (strict by label)
-        n_rgb = next(
-            (
-                n
-                for n in nodes
-                if getattr(n, "label", "") == LBL_EM_COLOR
-                and getattr(n, "type", "") == "RGB"
-            ),
-            None,
-        )
+        n_rgb = _smp_node(nt, "RGB", LBL_EM_COLOR)
         if n_rgb:
             try:
-                n_rgb.outputs[0].default_value = (*mat.skpbr.emission_color, 1.0)
+                n_rgb.outputs[0].default_value = (*sk.emission_color, 1.0)
             except Exception:
                 pass
 
         # Strength
-        strength_val = (
-            float(mat.skpbr.emission_strength) if bool(mat.skpbr.emission_on) else 0.0
-        )
+        strength_val = float(sk.emission_strength) if bool(sk.emission_on) else 0.0
         # Set on Principled (authoritative)
         if "Emission Strength" in n_bsdf.inputs:
             try:
@@ -2692,557 +2643,142 @@ def _emissive_apply_to_nodes(mat):
                 pass
 
         # Also set on our multiply math (strict by label & type)
-        n_mul = next(
-            (
-                n
-                for n in nodes
-                if getattr(n, "label", "") == LBL_EM_STRENGTH
-                and getattr(n, "type", "") == "MATH"
-            ),
-            None,
-        )
+        n_mul = _smp_node(nt, "MATH", LBL_EM_STRENGTH)
         if n_mul:
             try:
                 n_mul.inputs[1].default_value = strength_val
             except Exception:
                 pass
 
-        print(
-            f"[SkyrimPatcher] Emissive live: updated RGB+Strength for {mat.name} (on={mat.skpbr.emission_on}, str={strength_val:.3f})"
+        _logd(
+            "[SkyrimPatcher] Emissive live: updated RGB+Strength for %s (on=%s, str=%.3f)",
+            mat.name,
+            sk.emission_on,
+            strength_val,
         )
     except Exception as e:
         print("[SkyrimPatcher] _emissive_apply_to_nodes error:", e)
 
 
-def _smp_find_bsdf(nt):
-    for n in nt.nodes:
-        if getattr(n, "type", "") == "BSDF_PRINCIPLED":
-            return n
-    return None
-
+# tree pointer -> (node count, {(type, label): node name}); first node wins per key
+_SMP_NODE_IDX: Dict[int, Tuple[int, Dict[tuple, str]]] = {}
 
-def _smp_ensure_emission_chain(mat, glow_tex_path=None):
-    if not mat or not getattr(mat, "node_tree", None) or not hasattr(mat, "skpbr"):
-        return
-    nt = mat.node_tree
-    nodes = nt.nodes
-    links = nt.links
-    n_bsdf = _smp_find_bsdf(nt)
-    if not n_bsdf or "Emission" not in n_bsdf.inputs:
-        return
-    n_rgb = next(
-        (
-            n
-            for n in nodes
-            if getattr(n, "type", "") == "RGB"
-            and getattr(n, "label", "") == LBL_EM_COLOR
-        ),
-        None,
-    )
-    if not n_rgb:
-        n_rgb = nodes.new("ShaderNodeRGB")
-        n_rgb.label = LBL_EM_COLOR
-    try:
-        n_rgb.outputs[0].default_value = (*mat.skpbr.emission_color, 1.0)
-    except Exception:
-        pass
-    color_out = n_rgb.outputs["Color"]
-    if glow_tex_path:
-        n_tex = nodes.new("ShaderNodeTexImage")
-        n_tex.label = "Glow Map"
-        try:
-            _load_image(n_tex, glow_tex_path, "Non-Color")
-        except Exception:
-            pass
-        n_add = next(
-            (
-                n
-                for n in nodes
-                if getattr(n, "type", "") == "MIX_RGB"
-                and getattr(n, "label", "") == LBL_EM_ADD
-            ),
-            None,
-        )
-        if not n_add:
-            n_add = nodes.new("ShaderNodeMixRGB")
-            n_add.label = LBL_EM_ADD
-            n_add.blend_type = "ADD"
-            n_add.inputs[0].default_value = 1.0
-        if not n_add.inputs[1].is_linked:
-            links.new(n_rgb.outputs["Color"], n_add.inputs[1])
-        if n_tex.image and not n_add.inputs[2].is_linked:
-            links.new(n_tex.outputs["Color"], n_add.inputs[2])
-        color_out = n_add.outputs["Color"]
-    n_mul = next(
-        (
-            n
-            for n in nodes
-            if getattr(n, "type", "") == "MATH"
-            and getattr(n, "label", "") == LBL_EM_STRENGTH
-        ),
-        None,
-    )
-    if not n_mul:
-        n_mul = nodes.new("ShaderNodeMath")
-        n_mul.operation = "MULTIPLY"
-        n_mul.label = LBL_EM_STRENGTH
-    if not n_mul.inputs[0].is_linked:
-        links.new(color_out, n_mul.inputs[0])
-    sval = (
-        float(getattr(mat.skpbr, "emission_strength", 0.0))
-        if bool(getattr(mat.skpbr, "emission_on", False))
-        else 0.0
-    )
-    try:
-        n_mul.inputs[1].default_value = sval
-    except Exception:
-        pass
-    if not n_bsdf.inputs["Emission"].is_linked:
-        links.new(n_mul.outputs[0], n_bsdf.inputs["Emission"])
-    if "Emission Strength" in n_bsdf.inputs:
-        try:
-            n_bsdf.inputs["Emission Strength"].default_value = sval
-        except Exception:
-            pass
+# Image node labels that mark the Base/diffuse texture
+_BASE_TEX_PREFIXES = ("base", "diffuse", "albedo")
+_BASE_TEX_KEY = ("TEX_IMAGE", "#base")
 
 
-def _smp_apply_emissive_live(mat):
-    if not mat or not getattr(mat, "node_tree", None) or not hasattr(mat, "skpbr"):
-        return
-    nt = mat.node_tree
-    nodes = nt.nodes
-    n_bsdf = _smp_find_bsdf(nt)
-    n_rgb = next(
-        (
-            n
-            for n in nodes
-            if getattr(n, "type", "") == "RGB"
-            and getattr(n, "label", "") == LBL_EM_COLOR
-        ),
-        None,
-    )
-    n_mul = next(
-        (
-            n
-            for n in nodes
-            if getattr(n, "type", "") == "MATH"
-            and getattr(n, "label", "") == LBL_EM_STRENGTH
-        ),
-        None,
-    )
-    if n_rgb:
-        try:
-            n_rgb.outputs[0].default_value = (*mat.skpbr.emission_color, 1.0)
-        except Exception:
-            pass
-    sval = (
-        float(getattr(mat.skpbr, "emission_strength", 0.0))
-        if bool(getattr(mat.skpbr, "emission_on", False))
-        else 0.0
-    )
-    if n_mul:
-        try:
-            n_mul.inputs[1].default_value = sval
-        except Exception:
-            pass
-    if n_bsdf and "Emission Strength" in n_bsdf.inputs:
-        try:
-            n_bsdf.inputs["Emission Strength"].default_value = sval
-        except Exception:
-            pass
-
-
-# === SMP v202: Emissive helpers (auto-create Option A) ===
-def _smp_find_node(nt, type_name=None, label=None):
-    for n in nt.nodes:
-        if (type_name is None or getattr(n, "type", "") == type_name) and (
-            label is None or getattr(n, "label", "") == label
-        ):
-            return n
-    return None
-
-
-def _smp_get_material_output(nt):
+def _smp_index_nodes(nt) -> Dict[tuple, str]:
+    """
+    One pass: (type, label) -> node name, plus (type, None) for the first node of each
+    type and _BASE_TEX_KEY for the first Base-like image node.
+    """
+    idx = {}
     for n in nt.nodes:
-        if getattr(n, "type", "") == "OUTPUT_MATERIAL":
+        t = n.type
+        idx.setdefault((t, None), n.name)
+        if n.label:
+            idx.setdefault((t, n.label), n.name)
+            if t == "TEX_IMAGE" and n.label.lower().startswith(_BASE_TEX_PREFIXES):
+                idx.setdefault(_BASE_TEX_KEY, n.name)
+    return idx
+
+
+def _smp_node_index(nt, rebuild=False):
+    """(index, fresh) for nt; rebuilt when the node count changes or on request."""
+    key = nt.as_pointer()
+    count = len(nt.nodes)
+    entry = _SMP_NODE_IDX.get(key)
+    fresh = rebuild or entry is None or entry[0] != count
+    if fresh:
+        entry = (count, _smp_index_nodes(nt))
+        _SMP_NODE_IDX[key] = entry
+    return entry[1], fresh
+
+
+def _smp_node(nt, type_name, label=None):
+    """Cached (type, label) lookup; rebuilds when the node count changes or a hit is stale."""
+    idx, fresh = _smp_node_index(nt)
+    for _attempt in range(2):
+        name = idx.get((type_name, label))
+        n = nt.nodes.get(name) if name else None
+        if n is not None and n.type == type_name and (label is None or n.label == label):
             return n
+        if fresh:
+            return None
+        # Relabelled/renamed without a count change; rescan once
+        idx, fresh = _smp_node_index(nt, rebuild=True)
     return None
 
 
-def _smp_find_bsdf(nt):
-    for n in nt.nodes:
-        if getattr(n, "type", "") == "BSDF_PRINCIPLED":
+def _find_base_tex(nt):
+    """Cached Base/diffuse image node (label starts with base/diffuse/albedo), or None."""
+    idx, fresh = _smp_node_index(nt)
+    for _attempt in range(2):
+        name = idx.get(_BASE_TEX_KEY)
+        n = nt.nodes.get(name) if name else None
+        if (
+            n is not None
+            and n.type == "TEX_IMAGE"
+            and n.label.lower().startswith(_BASE_TEX_PREFIXES)
+        ):
             return n
+        if fresh:
+            return None
+        idx, fresh = _smp_node_index(nt, rebuild=True)
     return None
 
 
-def _smp_emission_detect_from_nif(mat):
-    """Return (detected_bool, color_tuple, strength_float)."""
-    try:
-        col = None
-        mul = None
-        detected = False
-        # common nif properties from pyNifly
-        for key in ("emissive_color", "Emissive Color", "EmitColor", "EmissiveColor"):
-            if hasattr(mat, "keys") and key in mat.keys():
-                v = mat[key]
-                if isinstance(v, (list, tuple)) and len(v) >= 3:
-                    col = (float(v[0]), float(v[1]), float(v[2]))
-        for key in (
-            "emissive_multiple",
-            "Emissive Multiple",
-            "EmissiveMultiple",
-            "emissiveMult",
-        ):
-            if hasattr(mat, "keys") and key in mat.keys():
-                try:
-                    mul = float(mat[key])
-                except Exception:
-                    pass
-        # flags
-        flags = ""
-        for fkey in (
-            "shader_flags_1",
-            "Shader_Flags_1",
-            "BSLighting_Shader_Flags_1",
-            "shader_flags_2",
-            "Shader_Flags_2",
-            "BSLighting_Shader_Flags_2",
-        ):
-            if hasattr(mat, "keys") and fkey in mat.keys():
-                try:
-                    flags += " " + str(mat[fkey]).upper()
-                except Exception:
-                    pass
-        if any(
-            tok in flags
-            for tok in (
-                "OWN_EMIT",
-                "EXTERNAL_EMITTANCE",
-                "SOFT_LIGHTING",
-                "EFFECT_LIGHTING",
-                "GLOW",
-            )
-        ):
-            detected = True
-        # heuristic: non-black color also counts
-        if col and any(c > 0.001 for c in col):
-            detected = True
-        if mul is None:
-            mul = 1.0 if detected else 0.0
-        if col is None:
-            col = (1.0, 1.0, 1.0)
-        return bool(detected), col, float(mul)
-    except Exception:
-        return False, (1.0, 1.0, 1.0), 0.0
-
-
-def _smp_ensure_emission_chain_optionA(mat, force_on=None):
-    """Ensure: RGB (UI color) -> Emission -> Mix with BSDF -> Output. Auto-create if missing.
-    If force_on is not None, it overrides mat.skpbr.emission_on for building.
-    """
-    if not mat or not getattr(mat, "node_tree", None):
-        return
-    nt = mat.node_tree
-    nodes = nt.nodes
-    links = nt.links
-    n_out = _smp_get_material_output(nt)
-    n_bsdf = _smp_find_bsdf(nt)
-    if not n_out or not n_bsdf:
-        return
-
-    # Decide ON/OFF
-    use_on = (
-        bool(force_on)
-        if force_on is not None
-        else bool(getattr(getattr(mat, "skpbr", None), "emission_on", False))
-    )
+def _smp_node_named(nt, name, type_name):
+    """Default-named node via the collection's name lookup, else the cached type index."""
+    n = nt.nodes.get(name)
+    if n is not None and n.type == type_name:
+        return n
+    return _smp_node(nt, type_name)
 
-    # Color node (always present when we manage emissive)
-    n_rgb = _smp_find_node(nt, "RGB", LBL_EM_COLOR)
-    if not n_rgb:
-        n_rgb = nodes.new("ShaderNodeRGB")
-        n_rgb.label = LBL_EM_COLOR
-
-    # Emission shader
-    n_em = _smp_find_node(nt, "EMISSION", LBL_EMISSION_NODE)
-    if not n_em:
-        n_em = nodes.new("ShaderNodeEmission")
-        n_em.label = LBL_EMISSION_NODE
-
-    # Mix Shader
-    n_mix = _smp_find_node(nt, "MIX_SHADER", LBL_EMISSION_MIX)
-    if not n_mix:
-        n_mix = nodes.new("ShaderNodeMixShader")
-        n_mix.label = LBL_EMISSION_MIX
-
-    # Ensure BSDF is wired into mix, and mix to output
-    # Find current link from BSDF to Output and reroute through Mix if needed
-    if n_out.inputs["Surface"].is_linked:
-        src = n_out.inputs["Surface"].links[0].from_node
-        if src is not n_mix:
-            # Rewire: output.Surface <- mix
-            links.new(n_mix.outputs["Shader"], n_out.inputs["Surface"])
-            # Ensure BSDF is on input[1] of mix (base)
-            links.new(n_bsdf.outputs["BSDF"], n_mix.inputs[1])
-    else:
-        links.new(n_mix.outputs["Shader"], n_out.inputs["Surface"])
-        links.new(n_bsdf.outputs["BSDF"], n_mix.inputs[1])
 
-    # Link color wheel to Emission color
-    try:
-        n_rgb.outputs[0].default_value = (
-            *getattr(mat.skpbr, "emission_color", (1.0, 1.0, 1.0)),
-            1.0,
-        )
-    except Exception:
-        pass
-    (
-        links.new(n_rgb.outputs["Color"], n_em.inputs["Color"])
-        if not n_em.inputs["Color"].is_linked
-        else None
-    )
+def _smp_find_bsdf(nt):
+    return _smp_node_named(nt, "Principled BSDF", "BSDF_PRINCIPLED")
 
-    # Strength drives Emission Strength and Mix Factor (0=off, 1=full)
-    sval = float(getattr(mat.skpbr, "emission_strength", 0.0)) if use_on else 0.0
-    try:
-        n_em.inputs["Strength"].default_value = sval
-    except Exception:
-        pass
-    # Mix factor: use_on gates it; we can map strength -> factor for preview (clamp 0..1)
-    try:
-        n_mix.inputs["Fac"].default_value = 1.0 if use_on and sval > 0.0 else 0.0
-    except Exception:
-        pass
 
-    # Connect emission into mix input[2]
-    (
-        links.new(n_em.outputs["Emission"], n_mix.inputs[2])
-        if not n_mix.inputs[2].is_linked
-        else None
-    )
+# mat name -> {helper tag: fingerprint} of the state each chain helper last wired;
+# the v206 panel hook calls its helper on every redraw
+_EMIS_FP: Dict[str, Dict[str, tuple]] = {}
 
 
-def _smp_apply_emission_live_optionA(mat):
-    if not mat or not getattr(mat, "node_tree", None):
-        return
+def _emis_fingerprint(mat) -> tuple:
     nt = mat.node_tree
-    nodes = nt.nodes
-    n_rgb = _smp_find_node(nt, "RGB", LBL_EM_COLOR)
-    n_em = _smp_find_node(nt, "EMISSION", LBL_EMISSION_NODE)
-    n_mix = _smp_find_node(nt, "MIX_SHADER", LBL_EMISSION_MIX)
-    use_on = bool(getattr(getattr(mat, "skpbr", None), "emission_on", False))
-    sval = float(getattr(mat.skpbr, "emission_strength", 0.0)) if use_on else 0.0
-
-    if n_rgb:
-        try:
-            n_rgb.outputs[0].default_value = (*mat.skpbr.emission_color, 1.0)
-        except Exception:
-            pass
-    if n_em:
-        try:
-            n_em.inputs["Strength"].default_value = sval
-        except Exception:
-            pass
-    if n_mix:
-        try:
-            n_mix.inputs["Fac"].default_value = 1.0 if use_on and sval > 0.0 else 0.0
-        except Exception:
-            pass
+    sk = getattr(mat, "skpbr", None)
+    state = None
+    if sk is not None:
+        state = (
+            bool(getattr(sk, "emission_on", False)),
+            round(float(getattr(sk, "emission_strength", 0.0)), 6),
+            tuple(round(float(c), 6) for c in getattr(sk, "emission_color", ())),
+        )
+    return (state, nt.as_pointer(), len(nt.nodes), len(nt.links))
 
 
-# === v205 Emission helpers (always-present color, Option A auto-create) ===
-def _v205_find(nt, type_id=None, label=None):
-    for n in nt.nodes:
-        if (type_id is None or getattr(n, "type", "") == type_id) and (
-            label is None or getattr(n, "label", "") == label
-        ):
-            return n
-    return None
+def _emis_unchanged(tag, mat) -> bool:
+    return _EMIS_FP.get(mat.name, {}).get(tag) == _emis_fingerprint(mat)
 
 
-def _v205_output(nt):
-    for n in nt.nodes:
-        if getattr(n, "type", "") == "OUTPUT_MATERIAL":
-            return n
-    return None
+def _emis_remember(tag, mat):
+    _EMIS_FP.setdefault(mat.name, {})[tag] = _emis_fingerprint(mat)
 
 
-def _v205_bsdf(nt):
+# === SMP v202: node lookup helpers (shared with the v206 emissive chain) ===
+def _smp_find_node(nt, type_name=None, label=None):
+    if type_name is not None:
+        return _smp_node(nt, type_name, label)
     for n in nt.nodes:
-        if getattr(n, "type", "") == "BSDF_PRINCIPLED":
+        if label is None or getattr(n, "label", "") == label:
             return n
     return None
 
 
-def _v205_emission_detect_from_nif(mat):
-    """Placeholder for PyNifly integration; returns (detected, color, strength)."""
-    try:
-        # Try common custom properties that pyNifly may set
-        col = None
-        mul = None
-        detected = False
-        for key in ("Emissive Color", "emissive_color", "EmitColor", "EmissiveColor"):
-            if hasattr(mat, "keys") and key in mat.keys():
-                v = mat[key]
-                if isinstance(v, (list, tuple)) and len(v) >= 3:
-                    col = (float(v[0]), float(v[1]), float(v[2]))
-        for key in (
-            "Emissive Multiple",
-            "emissive_multiple",
-            "EmissiveMultiple",
-            "emissiveMult",
-        ):
-            if hasattr(mat, "keys") and key in mat.keys():
-                try:
-                    mul = float(mat[key])
-                except:
-                    pass
-        flags = ""
-        for fkey in (
-            "Shader_Flags_1",
-            "shader_flags_1",
-            "BSLighting_Shader_Flags_1",
-            "Shader_Flags_2",
-            "shader_flags_2",
-        ):
-            if hasattr(mat, "keys") and fkey in mat.keys():
-                try:
-                    flags += " " + str(mat[fkey]).upper()
-                except:
-                    pass
-        if any(
-            tok in flags
-            for tok in (
-                "OWN_EMIT",
-                "EXTERNAL_EMITTANCE",
-                "SOFT_LIGHTING",
-                "EFFECT_LIGHTING",
-            )
-        ):
-            detected = True
-        if col and any(c > 0.001 for c in col):
-            detected = True
-        if col is None:
-            col = (1.0, 1.0, 1.0)
-        if mul is None:
-            mul = 1.0 if detected else 0.0
-        return bool(detected), col, float(mul)
-    except Exception:
-        return False, (1.0, 1.0, 1.0), 0.0
-
-
-def _v205_emission_ensure_chain(mat, force_on=None):
-    """Ensure: RGB(color) -> Emission -> Mix -> BSDF -> Output.
-    Always create RGB node and hook it; emission On/Off gates strength/fac.
-    """
-    if not mat or not getattr(mat, "node_tree", None):
-        return
-    nt = mat.node_tree
-    nodes = nt.nodes
-    links = nt.links
-    out = _v205_output(nt)
-    bsdf = _v205_bsdf(nt)
-    if not out or not bsdf:
-        return
-
-    # Create/find nodes
-    rgb = _v205_find(nt, "RGB", LBL_EM_COLOR)
-    if not rgb:
-        rgb = nodes.new("ShaderNodeRGB")
-        rgb.label = LBL_EM_COLOR
-        rgb.location = (bsdf.location.x - 500, bsdf.location.y - 200)
-
-    em = _v205_find(nt, "EMISSION", LBL_EM_NODE)
-    if not em:
-        em = nodes.new("ShaderNodeEmission")
-        em.label = LBL_EM_NODE
-        em.location = (bsdf.location.x - 250, bsdf.location.y - 150)
-
-    mix = _v205_find(nt, "MIX_SHADER", LBL_EM_MIX)
-    if not mix:
-        mix = nodes.new("ShaderNodeMixShader")
-        mix.label = LBL_EM_MIX
-        mix.location = (bsdf.location.x + 200, bsdf.location.y)
-
-    # Rewire Surface through mix once
-    if out.inputs["Surface"].is_linked:
-        if out.inputs["Surface"].links[0].from_node is not mix:
-            for l in list(links):
-                if l.to_node == out and l.to_socket.name == "Surface":
-                    links.remove(l)
-            links.new(mix.outputs["Shader"], out.inputs["Surface"])
-    else:
-        links.new(mix.outputs["Shader"], out.inputs["Surface"])
-
-    # Ensure BSDF base into mix
-    if not mix.inputs[1].is_linked:
-        links.new(bsdf.outputs["BSDF"], mix.inputs[1])
-    # Ensure RGB -> Emission color
-    if not em.inputs["Color"].is_linked:
-        links.new(rgb.outputs["Color"], em.inputs["Color"])
-    # Ensure Emission -> mix shader 2
-    if not mix.inputs[2].is_linked:
-        links.new(em.outputs["Emission"], mix.inputs[2])
-
-    # Apply values
-    sk = getattr(mat, "skpbr", None)
-    if sk:
-        try:
-            rgb.outputs[0].default_value = (
-                *getattr(sk, "emission_color", (1.0, 1.0, 1.0)),
-                1.0,
-            )
-        except:
-            pass
-        use_on = (
-            bool(getattr(sk, "emission_on", False))
-            if force_on is None
-            else bool(force_on)
-        )
-        sval = float(getattr(sk, "emission_strength", 0.0)) if use_on else 0.0
-    else:
-        use_on = False
-        sval = 0.0
-    try:
-        em.inputs["Strength"].default_value = sval
-    except:
-        pass
-    try:
-        mix.inputs["Fac"].default_value = 1.0 if (use_on and sval > 0.0) else 0.0
-    except:
-        pass
-
-
-def _v205_emission_live(mat):
-    """Live sync color & strength to nodes (assumes chain exists)."""
-    if not mat or not getattr(mat, "node_tree", None):
-        return
-    nt = mat.node_tree
-    nodes = nt.nodes
-    rgb = _v205_find(nt, "RGB", LBL_EM_COLOR)
-    em = _v205_find(nt, "EMISSION", LBL_EM_NODE)
-    mix = _v205_find(nt, "MIX_SHADER", LBL_EM_MIX)
-    sk = getattr(mat, "skpbr", None)
-    if not sk:
-        return
-    # color
-    if rgb:
-        try:
-            rgb.outputs[0].default_value = (*sk.emission_color, 1.0)
-        except:
-            pass
-    sval = float(sk.emission_strength) if sk.emission_on else 0.0
-    if em:
-        try:
-            em.inputs["Strength"].default_value = sval
-        except:
-            pass
-    if mix:
-        try:
-            mix.inputs["Fac"].default_value = 1.0 if sval > 0.0 else 0.0
-        except:
-            pass
+def _smp_get_material_output(nt):
+    return _smp_node_named(nt, "Material Output", "OUTPUT_MATERIAL")
 
 
 # ================== SMP v206 Append: UI cleanup + emissive hookup ==================
@@ -3265,27 +2801,17 @@ LBL_EM_NODE = "SMP Emission"
 LBL_EM_MIX = "SMP Emission Mix"
 
 
-def _smp_n_find(nt, type_id=None, label=None):
-    for n in nt.nodes:
-        if (type_id is None or getattr(n, "type", "") == type_id) and (
-            label is None or getattr(n, "label", "") == label
-        ):
-            return n
-    return None
-
-
-def _smp_n_out(nt):
-    for n in nt.nodes:
-        if getattr(n, "type", "") == "OUTPUT_MATERIAL":
-            return n
-    return None
-
-
-def _smp_n_bsdf(nt):
-    for n in nt.nodes:
-        if getattr(n, "type", "") == "BSDF_PRINCIPLED":
-            return n
-    return None
+def _smp_link(links, from_sock, to_sock):
+    """
+    Link from_sock -> to_sock unless that exact link exists. links.new replaces the
+    input's old link itself, so a rewire is one mutation rather than remove + new.
+    """
+    for lk in to_sock.links:
+        # == compares the underlying sockets; node/socket wrappers are never `is`-equal
+        if lk.from_socket == from_sock:
+            return False
+    links.new(from_sock, to_sock)
+    return True
 
 
 def _smp_ensure_emissive_chain(mat):
@@ -3294,25 +2820,27 @@ def _smp_ensure_emissive_chain(mat):
     nt = mat.node_tree
     if not nt:
         return
-    out = _smp_n_out(nt)
-    bsdf = _smp_n_bsdf(nt)
+    if _emis_unchanged("v206_chain", mat):
+        return  # wired for exactly this state on a previous draw
+    out = _smp_get_material_output(nt)
+    bsdf = _smp_find_bsdf(nt)
     if not out or not bsdf:
         return
     links = nt.links
 
-    rgb = _smp_n_find(nt, "RGB", LBL_EM_COLOR)
+    rgb = _smp_find_node(nt, "RGB", LBL_EM_COLOR)
     if not rgb:
         rgb = nt.nodes.new("ShaderNodeRGB")
         rgb.label = LBL_EM_COLOR
         rgb.location = (bsdf.location.x - 500, bsdf.location.y - 200)
 
-    emis = _smp_n_find(nt, "EMISSION", LBL_EM_NODE)
+    emis = _smp_find_node(nt, "EMISSION", LBL_EM_NODE)
     if not emis:
         emis = nt.nodes.new("ShaderNodeEmission")
         emis.label = LBL_EM_NODE
         emis.location = (bsdf.location.x - 250, bsdf.location.y - 150)
 
-    mix = _smp_n_find(nt, "MIX_SHADER", LBL_EM_MIX)
+    mix = _smp_find_node(nt, "MIX_SHADER", LBL_EM_MIX)
     if not mix:
         mix = nt.nodes.new("ShaderNodeMixShader")
         mix.label = LBL_EM_MIX
@@ -3325,43 +2853,30 @@ def _smp_ensure_emissive_chain(mat):
         links.new(rgb.outputs["Color"], emis.inputs["Color"])
     if not mix.inputs[2].is_linked:
         links.new(emis.outputs["Emission"], mix.inputs[2])
-    if out.inputs["Surface"].is_linked:
-        if out.inputs["Surface"].links[0].from_node is not mix:
-            # replace existing
-            for l in list(links):
-                if l.to_node == out and l.to_socket.name == "Surface":
-                    links.remove(l)
-            links.new(mix.outputs["Shader"], out.inputs["Surface"])
-    else:
-        links.new(mix.outputs["Shader"], out.inputs["Surface"])
+    _smp_link(links, mix.outputs["Shader"], out.inputs["Surface"])
 
-    # Drive from mat.skpbr (support both emission_* and emissive_* names)
-    on = False
-    strength = 0.0
-    color = (1.0, 1.0, 1.0)
+    # Drive from mat.skpbr
     sk = getattr(mat, "skpbr", None)
     if sk is not None:
-        on = bool(getattr(sk, "emission_on", getattr(sk, "emissive_on", False)))
-        strength = float(
-            getattr(sk, "emission_strength", getattr(sk, "emissive_strength", 0.0))
-        )
-        col = getattr(sk, "emission_color", getattr(sk, "emissive_color", None))
-        if isinstance(col, (list, tuple)) and len(col) >= 3:
-            color = (float(col[0]), float(col[1]), float(col[2]))
+        on = bool(sk.emission_on)
+        strength = float(sk.emission_strength)
+        col = sk.emission_color
+        color = (float(col[0]), float(col[1]), float(col[2]))
+    else:
+        on, strength, color = False, 0.0, (1.0, 1.0, 1.0)
 
     try:
         rgb.outputs[0].default_value = (color[0], color[1], color[2], 1.0)
     except Exception:
         pass
     val = strength if (on and strength > 0.0) else 0.0
-    try:
-        emis.inputs["Strength"].default_value = val
-    except Exception:
-        pass
-    try:
-        mix.inputs["Fac"].default_value = 1.0 if val > 0.0 else 0.0
-    except Exception:
-        pass
+    sock = emis.inputs.get("Strength")
+    if sock is not None:
+        sock.default_value = val
+    sock = mix.inputs.get("Fac")
+    if sock is not None:
+        sock.default_value = 1.0 if val > 0.0 else 0.0
+    _emis_remember("v206_chain", mat)
 
 
 # -------- Replace main panel draw to remove duplicates & ensure wiring --------
@@ -3373,16 +2888,46 @@ except Exception:
     _ORIG_DRAW = None
 
 
+# Redraws far outnumber edits: rewire only when the active material changed or a
+# material / node tree was updated since the last draw
+_SMP_DRAW_DIRTY = True
+_SMP_LAST_DRAWN_MAT = 0  # as_pointer() of the material wired on the last draw
+
+
+@persistent
+def _smp_on_undo_redo(*_args):
+    # Undo/redo rebuilds datablocks; cached image names may now point elsewhere,
+    # and node values no longer match what was last applied
+    _IMAGE_CACHE.clear()
+    _EM_APPLIED.clear()
+    _EMIS_FP.clear()
+    _ALPHA_FP.clear()
+
+
+@persistent
+def _smp_on_depsgraph_update(_scene, depsgraph):
+    global _SMP_DRAW_DIRTY
+    if depsgraph.id_type_updated("MATERIAL") or depsgraph.id_type_updated(
+        "NODETREE"
+    ):
+        _SMP_DRAW_DIRTY = True
+
+
 def _SMP_v206_draw(self, context):
+    global _SMP_DRAW_DIRTY, _SMP_LAST_DRAWN_MAT
     # Render original UI
     if _ORIG_DRAW is not None:
         _ORIG_DRAW(self, context)
 
     # Now fix duplicates by re-drawing a clean, minimal section at the end (optional)
-    # and ensure emissive chain is wired every time the panel draws.
+    # and ensure emissive chain is wired whenever the drawn material changed.
     try:
         mat = context.object.active_material if context.object else None
-        _smp_ensure_emissive_chain(mat)
+        ptr = mat.as_pointer() if mat else 0
+        if _SMP_DRAW_DIRTY or ptr != _SMP_LAST_DRAWN_MAT:
+            _smp_ensure_emissive_chain(mat)
+            _SMP_DRAW_DIRTY = False
+            _SMP_LAST_DRAWN_MAT = ptr
     except Exception:
         pass
 
@@ -3406,25 +2951,29 @@ if _SKPANEL is not None:
 
 def _smp_selected_materials(include_active=True):
     """Yield unique materials from all selected mesh objects (optionally include active mat)."""
-    import bpy
-
+    # Keyed by pointer: each slot access hands back a fresh Python wrapper, so id()
+    # doesn't identify the material
     seen = set()
     mats = []
     ctx = bpy.context
     if include_active:
         mat = _get_active_material(ctx)
-        if mat and id(mat) not in seen:
+        if mat:
             mats.append(mat)
-            seen.add(id(mat))
-    for obj in getattr(ctx, "selected_objects", []) or []:
+            seen.add(mat.as_pointer())
+    selected = getattr(ctx, "selected_objects", None) or ()
+    for obj in selected:
+        if obj.type != "MESH":
+            continue
         try:
-            if getattr(obj, "type", "") != "MESH":
-                continue
-            for slot in getattr(obj, "material_slots", []) or []:
-                mat = getattr(slot, "material", None)
-                if mat and id(mat) not in seen:
+            for slot in obj.material_slots:
+                mat = slot.material
+                if mat is None:
+                    continue
+                ptr = mat.as_pointer()
+                if ptr not in seen:
+                    seen.add(ptr)
                     mats.append(mat)
-                    seen.add(id(mat))
         except Exception:
             pass
     return mats
@@ -3432,8 +2981,6 @@ def _smp_selected_materials(include_active=True):
 
 def _smp_set_prop_if_exists(mat, prop_name, value):
     """Set skpbr.prop_name on mat if present, guarding against re-entrant updates."""
-    import bpy
-
     global _SMP_PROP_SYNC_GUARD
     try:
         s = getattr(mat, "skpbr", None)
@@ -3465,32 +3012,45 @@ def _smp_set_prop_if_exists(mat, prop_name, value):
         _SMP_PROP_SYNC_GUARD = False
 
 
+# mat name -> _alpha_fingerprint of the last completed _apply_alpha_logic
+_ALPHA_FP: Dict[str, tuple] = {}
+
+
+def _alpha_fingerprint(mat, strength) -> tuple:
+    nt = mat.node_tree
+    return (
+        round(strength, 6),
+        str(mat.get("skpbr_alpha_mode", "NONE")),
+        nt.as_pointer(),
+        len(nt.nodes),
+        len(nt.links),
+    )
+
+
 def _on_alpha_strength_changed(s):
     """Called when the Alpha Strength slider changes (live preview + sync) across selection."""
     global _SMP_PROP_SYNC_GUARD
     if _SMP_PROP_SYNC_GUARD:
         return
     try:
-        import bpy
-
         val = float(getattr(s, "alpha_strength", 1.0))
         for m in _smp_selected_materials(include_active=True):
+            nt = getattr(m, "node_tree", None)
+            # Redraws re-fire the update with the same value; nothing to rewire
+            if (
+                nt
+                and m.get("skpbr_alpha_strength") == val
+                and _ALPHA_FP.get(m.name) == _alpha_fingerprint(m, val)
+            ):
+                continue
             try:
                 m["skpbr_alpha_strength"] = val
             except Exception:
                 pass
             _smp_set_prop_if_exists(m, "alpha_strength", val)
             # Find Base texture for correct wiring
-            base_tex_node = None
-            if getattr(m, "node_tree", None):
-                nt = m.node_tree
-                for n in nt.nodes:
-                    if getattr(n, "type", "") == "TEX_IMAGE" and getattr(
-                        n, "label", ""
-                    ).lower().startswith("base"):
-                        base_tex_node = n
-                        break
-                _apply_alpha_logic(m, base_tex_node)
+            if nt:
+                _apply_alpha_logic(m, _find_base_tex(nt))
     except Exception as e:
         print(f"[SMP] Alpha strength update failed: {e}")
 
@@ -3507,50 +3067,78 @@ def _extract_alpha_from_nif_for_object(obj) -> dict | None:
 
         # Try to resolve a NIF path via custom props if not set
         if not nif_path and hasattr(obj, "keys"):
-            for k in obj.keys():
+            for _k, v in obj.items():
                 try:
-                    v = str(obj[k])
+                    v = str(v)
                 except Exception:
                     continue
-                if v.lower().endswith(".nif"):
+                if v[-4:].lower() == _NIF_SUFFIX:
                     nif_path = v
                     break
 
         if not nif_path:
             return None
 
-        info = None
-        # Prefer VFS-read if available
-        if _smp_vfs_exists(nif_path):
-            with _smp_open(nif_path, "rb") as f:
-                data = f.read()
-            if hasattr(nifparser, "parse_nif_alpha"):
-                info = nifparser.parse_nif_alpha(
-                    data, match_name=getattr(obj, "name", None)
-                )
-        elif os.path.exists(nif_path) and hasattr(nifparser, "parse_nif_alpha"):
-            info = nifparser.parse_nif_alpha(
-                nif_path, match_name=getattr(obj, "name", None)
-            )
-
+        info = _parse_nif_alpha_cached(str(nif_path), getattr(obj, "name", None))
         return info if info else None
     except Exception as e:
         _log(f"[NIF Alpha] read failed: {e}")
         return None
 
 
+@functools.lru_cache(maxsize=16)
+def _read_nif_bytes(nif_path):
+    """Whole VFS file; shared by every match_name queried against the same NIF."""
+    with _smp_open(nif_path, "rb") as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_nif_alpha_cached(nif_path, match_name):
+    """parse_nif_alpha once per (NIF, object name); the result dict is read-only."""
+    if not hasattr(_nif(), "parse_nif_alpha"):
+        return None
+    # Prefer VFS-read if available
+    if _smp_vfs_exists(nif_path):
+        return nifparser.parse_nif_alpha(
+            _read_nif_bytes(nif_path), match_name=match_name
+        )
+    if os.path.exists(nif_path):
+        return nifparser.parse_nif_alpha(nif_path, match_name=match_name)
+    return None
+
+
+# (image name, filepath, size) -> soft-alpha verdict; images are shared across materials
+_SOFT_ALPHA_CACHE: Dict[tuple, bool] = {}
+
+
 def _image_has_soft_alpha(img) -> bool:
     """Heuristic to pick BLEND vs CLIP from texture alpha when NIF data is missing."""
     try:
         if not img:
             return False
+        key = (img.name, img.filepath, tuple(img.size))
+        hit = _SOFT_ALPHA_CACHE.get(key)
+        if hit is not None:
+            return hit
         if not getattr(img, "has_data", True):
             img.reload()
-        a = img.pixels[3::4]
-        if not a:
+        px = img.pixels
+        n = len(px)
+        if n < 4:
             return False
-        step = max(1, len(a) // 4096)
-        return any(0.0 < a[i] < 1.0 for i in range(0, len(a), step))
+        step = max(1, (n // 4) // 4096)
+        if np is not None:
+            # One C-side copy of the buffer, then a vectorised test on ~4096 alpha samples
+            buf = np.empty(n, dtype=np.float32)
+            px.foreach_get(buf)
+            a = buf[3::4][::step]
+            soft = bool(((a > 0.0) & (a < 1.0)).any())
+        else:
+            # Index only the sampled alphas; slicing would box the whole buffer
+            soft = any(0.0 < px[i] < 1.0 for i in range(3, n, 4 * step))
+        _SOFT_ALPHA_CACHE[key] = soft
+        return soft
     except Exception:
         return False
 
@@ -3558,16 +3146,8 @@ def _image_has_soft_alpha(img) -> bool:
 def _init_alpha_from_nif(mat: bpy.types.Material):
     """Store the NIF-driven mode on the material for preview/exporters."""
     try:
-        user_obj = None
-        for ob in bpy.data.objects:
-            if ob.type != "MESH":
-                continue
-            for slot in ob.material_slots:
-                if slot.material is mat:
-                    user_obj = ob
-                    break
-            if user_obj:
-                break
+        # Shared material -> first mesh user index; one object walk per scene change
+        user_obj = _material_user(mat)
 
         mode, thr = "NONE", None
         info = _extract_alpha_from_nif_for_object(user_obj) if user_obj else None
@@ -3594,23 +3174,16 @@ def _init_alpha_from_nif(mat: bpy.types.Material):
 def _apply_alpha_logic(mat, base_tex_node=None):
     # Ensure ALPHAGOOD-style alpha wiring: Base Alpha -> (Multiply 'Alpha Strength') -> BSDF Alpha; auto blend/shadow.
     try:
-        import bpy
-
         nt = getattr(mat, "node_tree", None)
         if not nt:
             return
-        bsdf = next((n for n in nt.nodes if n.type == "BSDF_PRINCIPLED"), None)
-        if not bsdf:
+        bsdf = _smp_find_bsdf(nt)
+        alpha_in = bsdf.inputs.get("Alpha") if bsdf else None
+        if alpha_in is None:
             return
         # Find Base texture node by label if not provided
         if not base_tex_node:
-            for n in nt.nodes:
-                if (
-                    getattr(n, "type", "") == "TEX_IMAGE"
-                    and "base" in (getattr(n, "label", "") or "").lower()
-                ):
-                    base_tex_node = n
-                    break
+            base_tex_node = _find_base_tex(nt)
         if not base_tex_node:
             return
 
@@ -3619,11 +3192,7 @@ def _apply_alpha_logic(mat, base_tex_node=None):
         links = nt.links
 
         # Find existing Multiply node (labeled)
-        mul = None
-        for n in nt.nodes:
-            if n.type == "MATH" and getattr(n, "label", "") == "Alpha Strength":
-                mul = n
-                break
+        mul = _smp_node(nt, "MATH", "Alpha Strength")
 
         def safe_unlink_out(sock):
             for l in list(getattr(sock, "links", [])):
@@ -3643,25 +3212,13 @@ def _apply_alpha_logic(mat, base_tex_node=None):
                     base_tex_node.location.y - 120,
                 )
                 # connect Base Alpha to mul[0], mul -> BSDF Alpha
-                try:
-                    links.new(base_tex_node.outputs["Alpha"], mul.inputs[0])
-                except Exception:
-                    pass
-                try:
-                    # Remove any direct Base->BSDF Alpha links to avoid doubles
-                    try:
-                        for l in list(bsdf.inputs["Alpha"].links):
-                            nt.links.remove(l)
-                    except Exception:
-                        pass
-                    links.new(mul.outputs[0], bsdf.inputs["Alpha"])
-                except Exception:
-                    pass
+                base_alpha = base_tex_node.outputs.get("Alpha")
+                if base_alpha is not None:
+                    links.new(base_alpha, mul.inputs[0])
+                # Replaces any direct Base->BSDF Alpha link, so no doubles
+                _smp_link(links, mul.outputs[0], alpha_in)
             # Update strength factor
-            try:
-                mul.inputs[1].default_value = strength
-            except Exception:
-                pass
+            mul.inputs[1].default_value = strength
         else:
             # Full opacity -> remove multiply node and connect directly
             if mul:
@@ -3671,119 +3228,35 @@ def _apply_alpha_logic(mat, base_tex_node=None):
                 except Exception:
                     pass
             # Ensure at least a direct link exists
-            direct = any(
-                l.to_node == bsdf
-                and getattr(l, "to_socket", None)
-                and getattr(l.to_socket, "name", "") == "Alpha"
-                for l in nt.links
-            )
-            if not direct:
-                try:
-                    links.new(base_tex_node.outputs["Alpha"], bsdf.inputs["Alpha"])
-                except Exception:
-                    pass
-
-        # Adjust viewport/material alpha modes
+            if not alpha_in.is_linked:
+                base_alpha = base_tex_node.outputs.get("Alpha")
+                if base_alpha is not None:
+                    links.new(base_alpha, alpha_in)
+
+        # Viewport modes follow Skyrim: NIF mode (NONE -> OPAQUE, CLIP, BLEND with
+        # HASHED shadows), guessed from the Base alpha when the NIF gave none;
+        # a reduced Alpha Strength needs BLEND to show at all
+        mode = str(mat.get("skpbr_alpha_mode", "NONE")).upper()
+        if strength < 1.0:
+            mode = "BLEND"
+        elif mode == "NONE" and getattr(base_tex_node, "image", None):
+            mode = "BLEND" if _image_has_soft_alpha(base_tex_node.image) else "CLIP"
         try:
-            mat.blend_method = "BLEND" if strength < 1.0 else "OPAQUE"
-        except Exception:
-            pass
-        try:
-            mat.shadow_method = "HASHED" if strength < 1.0 else "OPAQUE"
+            if mode == "BLEND":
+                mat.blend_method, mat.shadow_method = "BLEND", "HASHED"
+            elif mode == "CLIP":
+                mat.blend_method, mat.shadow_method = "CLIP", "CLIP"
+            else:
+                mat.blend_method, mat.shadow_method = "OPAQUE", "OPAQUE"
         except Exception:
             pass
+        _ALPHA_FP[mat.name] = _alpha_fingerprint(mat, strength)
 
     except Exception as e:
         print(
             f"[SMP] _apply_alpha_logic failed for {getattr(mat, 'name', '<mat>')}: {e}"
         )
 
-    """
-    Apply Blender preview consistent with Skyrim:
-      NONE  -> OPAQUE
-      CLIP  -> CLIP
-      BLEND -> BLEND (HASHED shadows)
-    Then wire Base Alpha → BSDF Alpha if present, with optional Alpha Strength multiply.
-    """
-    if not mat or not mat.node_tree:
-        return
-    nt = mat.node_tree
-    links = nt.links
-
-    # Find Principled BSDF
-    bsdf = None
-    for n in nt.nodes:
-        if (
-            getattr(n, "type", "") == "BSDF_PRINCIPLED"
-            or getattr(n, "label", "") == "Principled BSDF"
-        ):
-            bsdf = n
-            break
-    if not bsdf or not bsdf.inputs.get("Alpha"):
-        try:
-            mat.blend_method = "OPAQUE"
-            mat.shadow_method = "OPAQUE"
-        except Exception:
-            pass
-        return
-
-    # Decide mode
-    mode = str(mat.get("skpbr_alpha_mode", "NONE")).upper()
-    if mode == "NONE" and base_tex_node and getattr(base_tex_node, "image", None):
-        mode = "BLEND" if _image_has_soft_alpha(base_tex_node.image) else "CLIP"
-
-    # Apply Blender preview modes
-    try:
-        if mode == "BLEND":
-            mat.blend_method = "BLEND"
-            mat.shadow_method = "HASHED"
-        elif mode == "CLIP":
-            mat.blend_method = "CLIP"
-            mat.shadow_method = "CLIP"
-        else:
-            mat.blend_method = "OPAQUE"
-            mat.shadow_method = "OPAQUE"
-    except Exception:
-        pass
-
-    # Wire Base Alpha → BSDF Alpha
-    try:
-        for lk in list(bsdf.inputs["Alpha"].links):
-            links.remove(lk)
-        if base_tex_node and base_tex_node.outputs.get("Alpha"):
-            links.new(base_tex_node.outputs["Alpha"], bsdf.inputs["Alpha"])
-    except Exception as e:
-        _log(f"[NIF Alpha] rewire failed: {e}")
-
-    # Optional Alpha Strength multiplier (preview only)
-    try:
-        strength = 1.0
-        if hasattr(mat, "keys") and "skpbr_alpha_strength" in mat:
-            strength = float(mat["skpbr_alpha_strength"])
-        if strength != 1.0 and base_tex_node and base_tex_node.outputs.get("Alpha"):
-            # Reuse/create a Math(MULTIPLY) node labeled 'Alpha Strength'
-            mult = None
-            for n in nt.nodes:
-                if (
-                    getattr(n, "label", "") == "Alpha Strength"
-                    and getattr(n, "bl_idname", "") == "ShaderNodeMath"
-                ):
-                    mult = n
-                    break
-            if mult is None:
-                mult = nt.nodes.new("ShaderNodeMath")
-                mult.operation = "MULTIPLY"
-                mult.label = "Alpha Strength"
-                mult.location = (bsdf.location.x - 240, bsdf.location.y - 220)
-            mult.inputs[1].default_value = strength
-            # Reroute through multiplier
-            for lk in list(bsdf.inputs["Alpha"].links):
-                links.remove(lk)
-            links.new(base_tex_node.outputs["Alpha"], mult.inputs[0])
-            links.new(mult.outputs[0], bsdf.inputs["Alpha"])
-    except Exception as e:
-        _log(f"[NIF Alpha] strength apply failed: {e}")
-
 
 # === End injected ===
 
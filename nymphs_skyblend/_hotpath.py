@@ -0,0 +1,178 @@
+"""
+Texture-resolution helpers that run per material in batch builds.
+
+Deliberately free of bpy so the module can be compiled ahead of time with mypyc
+(``mypyc nymphs_skyblend/_hotpath.py``). Python picks up the compiled extension when
+one sits next to this file and falls back to the .py otherwise; signatures are the
+same either way.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+KNOWN_SUFFIXES = [
+    "_d",
+    "_n",
+    "_rmaos",
+    "_p",
+    "_e",
+    "_em",
+    "_g",
+    "_orm",
+    "_m",
+    "_s",
+    "_spec",
+    "_specular",
+]
+
+
+# Slot -> file name suffixes tried (in order) after the shared base stem
+_SUFFIX_TEMPLATES = (
+    ("BASE", ("", "_d")),
+    ("NORMAL", ("_n",)),
+    ("RMAOS", ("_rmaos", "_orm")),
+    ("PARALLAX", ("_p",)),
+    ("EMISSIVE", ("_em", "_e", "_g")),
+)
+
+
+# Suffixes without the leading "_", for a single rpartition("_") + set lookup
+_SUFFIX_SET = frozenset(s[1:] for s in KNOWN_SUFFIXES)
+_KNOWN_DIFFUSE_REJECTS = frozenset(("n", "rmaos", "orm", "p", "e", "em", "g"))
+
+
+def _split_stem(p: str) -> Tuple[str, str]:
+    """(parent dir, stem) of a path string, matching Path.parent / Path.stem."""
+    d, name = os.path.split(p)
+    return d or ".", os.path.splitext(name)[0]
+
+
+def _is_diffuse_like(path: PathLike) -> bool:
+    """Heuristic: treat files without known suffix OR ending in _d as diffuse/base."""
+    # Accept "name.dds" and "name_d.dds"
+    _, sep, tail = _split_stem(os.fspath(path))[1].rpartition("_")
+    return not (sep and tail.lower() in _KNOWN_DIFFUSE_REJECTS)
+
+
+@functools.lru_cache(maxsize=512)
+def _dir_listing(d: str) -> Dict[str, str]:
+    """One readdir per folder: lowercase file name -> on-disk file name."""
+    try:
+        with os.scandir(d) as it:
+            return {e.name.lower(): e.name for e in it if e.is_file()}
+    except OSError:
+        return {}
+
+
+def _find_in_dirs(search_dirs: Iterable[str], names: Iterable[str]) -> Optional[str]:
+    for d in search_dirs:
+        listing = _dir_listing(d)
+        for nm in names:
+            real = listing.get(nm.lower())
+            if real:
+                return os.path.join(d, real)
+    return None
+
+
+@functools.lru_cache(maxsize=8192)
+def _is_file_cached(p: str) -> bool:
+    try:
+        return os.path.isfile(p)
+    except OSError:
+        return False
+
+
+def _fs_cache_clear():
+    """Forget cached listings/stat results; called when a build/patch run starts."""
+    _dir_listing.cache_clear()
+    _is_file_cached.cache_clear()
+
+
+def _search_dirs(base_dir: str, prefs: Any) -> Tuple[str, ...]:
+    """Manual root first (MANUAL mode, if it exists), then the texture's own folder."""
+    base_dir = os.path.normpath(base_dir)
+    if prefs.search_mode == "MANUAL" and prefs.manual_root:
+        mr = os.path.normpath(prefs.manual_root)
+        if os.path.isdir(mr) and mr != base_dir:
+            return (mr, base_dir)
+    return (base_dir,)
+
+
+def _determine_base_diffuse(anchor: PathLike, prefs: Any) -> Optional[Path]:
+    """Pick the base diffuse to anchor the set. Prefer explicit diffuse files."""
+    anchor_s = os.fspath(anchor)
+    base_dir, stem = _split_stem(anchor_s)
+    stem = _strip_known_suffixes(stem)
+
+    candidates = [stem + suf + ".dds" for suf in _SUFFIX_TEMPLATES[0][1]]
+
+    p = _find_in_dirs(_search_dirs(base_dir, prefs), candidates)
+    if p:
+        return Path(p)
+
+    # If nothing found, accept the anchor itself if it looks like a diffuse/base
+    try:
+        if _is_diffuse_like(anchor_s):
+            return Path(anchor_s)
+    except Exception:
+        pass
+    return None
+
+
+def _gather_strict_set(base_diffuse: PathLike, prefs: Any) -> Dict[str, Optional[Path]]:
+    """Gather only maps with the same base stem as the diffuse. Search manual root first if set."""
+    base_s = os.fspath(base_diffuse)
+    base_dir, stem = _split_stem(base_s)
+    stem = _strip_known_suffixes(stem)
+    search_dirs = _search_dirs(base_dir, prefs)
+
+    # BASE is the provided diffuse, ensure it is set
+    out = {"BASE": Path(base_s) if _is_file_cached(base_s) else None}
+    for k, sufs in _SUFFIX_TEMPLATES[1:]:
+        p = _find_in_dirs(search_dirs, [stem + suf + ".dds" for suf in sufs])
+        out[k] = Path(p) if p else None
+    return out
+
+
+def _strip_known_suffixes(stem: str) -> str:
+    head, sep, tail = stem.rpartition("_")
+    return head if sep and tail.lower() in _SUFFIX_SET else stem
+
+
+def _gather_from_dir(base_dir: PathLike, stem: str) -> Dict[str, Optional[Path]]:
+    dirs = (os.fspath(base_dir),)
+    out = {}
+    for k, sufs in _SUFFIX_TEMPLATES:
+        p = _find_in_dirs(dirs, [stem + suf + ".dds" for suf in sufs])
+        out[k] = Path(p) if p else None
+    return out
+
+
+def _resolve_textures_for_anchor(
+    anchor: PathLike, prefs: Any
+) -> Dict[str, Optional[Path]]:
+    """Resolve textures by first determining the base diffuse, then gathering only matching stems."""
+    base = _determine_base_diffuse(anchor, prefs)
+    if not base:
+        # Fallback: use original behavior for BASE only
+        # (keeps compatibility if user anchors to a non-diffuse image with no real base on disk)
+        base = anchor
+    return _gather_strict_set(base, prefs)
+
+
+def _detect_pbr(textures: Dict[str, Optional[Path]]) -> bool:
+    """Only treat as PBR if a valid RMAOS/ORM map exists with the same stem as the base diffuse."""
+    base = textures.get("BASE")
+    if not base or not _is_file_cached(str(base)):
+        return False
+    stem = _strip_known_suffixes(base.stem).lower()
+
+    p = textures.get("RMAOS")
+    if p and _is_file_cached(str(p)) and _strip_known_suffixes(p.stem).lower() == stem:
+        return True
+    return False
+
@@ -1,7 +1,9 @@
 # ============================================================
 # Load bundled PyFFI safely (no global version expected)
 # ============================================================
-import importlib.util, os, sys
+import importlib, importlib.util, os, sys, traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
 
 addon_dir = os.path.dirname(__file__)
 local_pyffi = os.path.join(addon_dir, "thirdparty", "pyffi")
@@ -63,8 +65,12 @@ def is_window_material(block):
     return False
 
 
-def process_nif(in_path, out_path):
+def process_nif(in_path, out_path, emissive_multiple=None, emissive_color=None):
     """Load, modify, and save one NIF file."""
+    if emissive_multiple is None:
+        emissive_multiple = EMISSIVE_MULTIPLE
+    if emissive_color is None:
+        emissive_color = EMISSIVE_COLOR
     modified = 0
     try:
         data = NifFormat.Data()
@@ -77,9 +83,9 @@ def process_nif(in_path, out_path):
                     if not is_window_material(sub):
                         continue
                     sub.emissive_color.r, sub.emissive_color.g, sub.emissive_color.b = (
-                        EMISSIVE_COLOR
+                        emissive_color
                     )
-                    sub.emissive_multiple = EMISSIVE_MULTIPLE
+                    sub.emissive_multiple = emissive_multiple
                     modified += 1
 
         if modified == 0:
@@ -100,32 +106,121 @@ def process_nif(in_path, out_path):
         return False
 
 
-def main():
-    print(f"🔍 Scanning {INPUT_DIR}\n")
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def _scan_nifs(folder, recursive):
+    """Yield scandir entries for *.nif under folder (entries carry cached stat data)."""
+    try:
+        with os.scandir(folder) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs = []
+    for e in entries:
+        if e.is_file():
+            if e.name.lower().endswith(".nif"):
+                yield e
+        elif recursive and e.is_dir():
+            subdirs.append(e.path)
+    for d in subdirs:
+        yield from _scan_nifs(d, recursive)
+
+
+def iter_jobs(
+    input_dir, output_dir, emissive_multiple, emissive_color, skip_current=False
+):
+    """
+    Yield one (in_path, out_path, multiple, color) job per NIF under input_dir.
+
+    skip_current drops NIFs whose output copy is already newer than the source; only
+    meaningful with a separate output folder and unchanged emissive settings.
+    """
+    for e in _scan_nifs(input_dir, RECURSIVE):
+        in_path = e.path
+        rel_path = os.path.relpath(in_path, input_dir)
+        out_path = os.path.abspath(os.path.join(output_dir, rel_path))
+
+        if not OVERWRITE and os.path.exists(out_path):
+            continue
+        if skip_current:
+            try:
+                if os.stat(out_path).st_mtime_ns > e.stat().st_mtime_ns:
+                    continue
+            except OSError:
+                pass  # no output yet
 
-    total = 0
-    changed = 0
+        yield (in_path, out_path, emissive_multiple, emissive_color)
+
+
+def _patch_one(job):
+    """Pool worker; module-level so spawned processes can unpickle it."""
+    return process_nif(*job)
+
+
+def _patch_chunk(chunk):
+    """Pool worker for a slice of jobs; returns how many of them changed."""
+    return sum(1 for job in chunk if process_nif(*job))
 
-    for root, _, files in os.walk(INPUT_DIR):
-        for name in files:
-            if not name.lower().endswith(".nif"):
-                continue
-            total += 1
-            in_path = os.path.join(root, name)
-            rel_path = os.path.relpath(in_path, INPUT_DIR)
-            out_path = os.path.abspath(os.path.join(OUTPUT_DIR, rel_path))
 
-            if not OVERWRITE and os.path.exists(out_path):
-                continue
+def process_files(jobs, workers=None, executable=None, progress=None):
+    """
+    Patch every job and return how many NIFs changed.
 
-            if process_nif(in_path, out_path):
-                changed += 1
+    Jobs run in spawned worker processes (PyFFI parsing holds the GIL, so threads
+    don't help). Workers import this file as a top-level module, which keeps them
+    clear of the bpy-dependent addon package. If the pool can't start or breaks,
+    the whole list is redone serially; patching a NIF twice is harmless.
+    progress(done, total) is called as each chunk of jobs finishes.
+    """
+    jobs = list(jobs)
+    total = len(jobs)
+    workers = min(workers or mp.cpu_count() or 1, total)
+
+    if workers > 1:
+        here = os.path.dirname(os.path.abspath(__file__))
+        sys.path.insert(0, here)
+        try:
+            worker = importlib.import_module("patch_emissive")._patch_chunk
+            ctx = mp.get_context("spawn")
+            if executable:
+                ctx.set_executable(executable)
+            # ~4 chunks per worker: few round-trips, yet NIFs of very different
+            # sizes still spread out; results are taken in completion order
+            size = max(1, total // (workers * 4))
+            chunks = [jobs[i : i + size] for i in range(0, total, size)]
+            changed = done = 0
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                futures = {pool.submit(worker, c): len(c) for c in chunks}
+                for fut in as_completed(futures):
+                    changed += fut.result()
+                    done += futures[fut]
+                    if progress:
+                        progress(done, total)
+            return changed
+        except Exception:
+            print("[SMP] Process pool unavailable, patching serially")
+            traceback.print_exc()
+        finally:
+            try:
+                sys.path.remove(here)
+            except ValueError:
+                pass
+
+    changed = 0
+    for done, job in enumerate(jobs, 1):
+        if _patch_one(job):
+            changed += 1
+        if progress:
+            progress(done, total)
+    return changed
+
+
+def main():
+    print(f"🔍 Scanning {INPUT_DIR}\n")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-        if not RECURSIVE:
-            break
+    jobs = list(iter_jobs(INPUT_DIR, OUTPUT_DIR, EMISSIVE_MULTIPLE, EMISSIVE_COLOR))
+    changed = process_files(jobs)
 
-    print(f"\n✅ Done — patched {changed}/{total} NIFs.")
+    print(f"\n✅ Done — patched {changed}/{len(jobs)} NIFs.")
     print(f"📂 Output: {OUTPUT_DIR}")
 
 
@@ -12,35 +12,44 @@ import importlib.util
 
 _SKPBR_HAS_PYFFI = False
 NifFormat = None
+_pyffi_tried = False
 
-try:
-    addon_root = Path(__file__).resolve().parent
-    local_pyffi = addon_root / "thirdparty" / "pyffi"
 
-    if local_pyffi.exists():
-        old_sys = sys.path.copy()
-        sys.path.insert(0, str(local_pyffi))
+def _load_pyffi() -> bool:
+    """Load the bundled PyFFI on first use (slow mode only); returns availability."""
+    global _SKPBR_HAS_PYFFI, NifFormat, _pyffi_tried
+    if _pyffi_tried:
+        return _SKPBR_HAS_PYFFI
+    _pyffi_tried = True
+    try:
+        addon_root = Path(__file__).resolve().parent
+        local_pyffi = addon_root / "thirdparty" / "pyffi"
+
+        if local_pyffi.exists():
+            old_sys = sys.path.copy()
+            sys.path.insert(0, str(local_pyffi))
 
-        spec = importlib.util.spec_from_file_location(
-            "pyffi", str(local_pyffi / "__init__.py")
-        )
-        pyffi_mod = importlib.util.module_from_spec(spec)
-        sys.modules["pyffi"] = pyffi_mod
-        spec.loader.exec_module(pyffi_mod)
+            spec = importlib.util.spec_from_file_location(
+                "pyffi", str(local_pyffi / "__init__.py")
+            )
+            pyffi_mod = importlib.util.module_from_spec(spec)
+            sys.modules["pyffi"] = pyffi_mod
+            spec.loader.exec_module(pyffi_mod)
 
-        sys.path = old_sys
+            sys.path = old_sys
 
-        from pyffi.formats.nif import NifFormat as _NF
+            from pyffi.formats.nif import NifFormat as _NF
 
-        NifFormat = _NF
-        _SKPBR_HAS_PYFFI = True
-        print(f"[SKPBR] PyFFI loaded: {pyffi_mod.__file__}")
-    else:
-        print("[SKPBR] No bundled PyFFI found:", local_pyffi)
+            NifFormat = _NF
+            _SKPBR_HAS_PYFFI = True
+            print(f"[SKPBR] PyFFI loaded: {pyffi_mod.__file__}")
+        else:
+            print("[SKPBR] No bundled PyFFI found:", local_pyffi)
 
-except Exception as e:
-    print("[SKPBR] PyFFI load FAILED:", e)
-    _SKPBR_HAS_PYFFI = False
+    except Exception as e:
+        print("[SKPBR] PyFFI load FAILED:", e)
+        _SKPBR_HAS_PYFFI = False
+    return _SKPBR_HAS_PYFFI
 
 
 # ============================================================================
@@ -100,7 +109,7 @@ class SKPBR_OT_RunPBRNifPatcher(bpy.types.Operator):
     # ------------------------------------------------------------------
     def extract_textures_from_nif(self, nif_path: Path):
         textures = set()
-        if not (_SKPBR_HAS_PYFFI and NifFormat):
+        if not (_load_pyffi() and NifFormat):
             print("[SKPBR] Slow mode unavailable (no PyFFI).")
             return textures
 
@@ -184,7 +193,7 @@ class SKPBR_OT_RunPBRNifPatcher(bpy.types.Operator):
 
         else:
             # AUTO-MODE
-            if self.use_material_match and _SKPBR_HAS_PYFFI:
+            if self.use_material_match and _load_pyffi():
                 # SLOW MODE: ONLY use material-matched files
                 print("\n[SKPBR] SLOW MODE ACTIVE (material-based)")
                 all_jsons = self.fast_folder_json_search(mod_root, nif)